@@ -1,15 +1,19 @@
 """The Amit HVAC integration."""
+
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntryType
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.typing import ConfigType
 
 from .api import AmitApi
 from .api_helper import AmitApiHelper
+from .connection import async_get_connection_manager
 from .const import (
+    CONF_PLATFORMS,
     DEVICE_HEATING_ID,
     DEVICE_HEATING_NAME,
     DEVICE_VENTILATION_ID,
@@ -20,6 +24,9 @@ from .const import (
     PLC_MODEL,
     PLC_NAME,
 )
+from .coordinator import snapshot_store
+from .entity import device_identifier
+from .services import async_setup_services
 
 PLATFORMS: list[Platform] = [
     Platform.CLIMATE,
@@ -28,47 +35,141 @@ PLATFORMS: list[Platform] = [
     Platform.SENSOR,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Amit HVAC services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Amit HVAC from a config entry."""
+    platforms = _entry_platforms(entry)
 
     device_registry = dr.async_get(hass)
+    _async_migrate_device_identifiers(device_registry, entry)
+    plc_identifier = device_identifier(entry.entry_id, PLC_ID)
     device_registry.async_get_or_create(
         config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, PLC_ID)},
+        identifiers={plc_identifier},
         manufacturer=MANUFACTURER,
         name=PLC_NAME,
         model=PLC_MODEL,
     )
     device_registry.async_get_or_create(
         config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, DEVICE_HEATING_ID)},
+        identifiers={device_identifier(entry.entry_id, DEVICE_HEATING_ID)},
         name=DEVICE_HEATING_NAME,
         manufacturer=MANUFACTURER,
-        via_device=(DOMAIN, PLC_ID),
+        via_device=plc_identifier,
         entry_type=DeviceEntryType.SERVICE,
     )
     device_registry.async_get_or_create(
         config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, DEVICE_VENTILATION_ID)},
+        identifiers={device_identifier(entry.entry_id, DEVICE_VENTILATION_ID)},
         name=DEVICE_VENTILATION_NAME,
         manufacturer=MANUFACTURER,
-        via_device=(DOMAIN, PLC_ID),
+        via_device=plc_identifier,
         entry_type=DeviceEntryType.SERVICE,
     )
 
     hass.data.setdefault(DOMAIN, {})
 
-    hass.data[DOMAIN][entry.entry_id] = AmitApiHelper(hass, AmitApi(entry))
+    manager = async_get_connection_manager(hass)
+    connection = manager.async_register(entry)
+    entry.async_on_unload(lambda: manager.async_unregister(entry))
+
+    helper = AmitApiHelper(hass, AmitApi(hass, entry, connection))
+    # Also closes the session when the setup fails and is retried
+    entry.async_on_unload(helper.api.async_close)
+    # Entities start from the data saved by the previous run when there is some,
+    # the PLC is only waited for on the very first setup.
+    restored = await helper.coordinator.async_restore()
+    if not restored:
+        await helper.coordinator.async_config_entry_first_refresh()
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    helper.platforms = platforms
+    helper.options = dict(entry.options)
+    hass.data[DOMAIN][entry.entry_id] = helper
+
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+    if restored:
+        entry.async_create_background_task(
+            hass, helper.coordinator.async_refresh(), "amit_hvac first refresh"
+        )
+
+    entry.async_on_unload(entry.add_update_listener(async_update_entry))
 
     return True
 
 
+def _entry_platforms(entry: ConfigEntry) -> list[Platform]:
+    """Return the platforms enabled in the options of an entry."""
+    return [
+        Platform(platform) for platform in entry.options.get(CONF_PLATFORMS, PLATFORMS)
+    ]
+
+
+@callback
+def _async_migrate_device_identifiers(
+    device_registry: dr.DeviceRegistry, entry: ConfigEntry
+) -> None:
+    """Scope devices registered with the old fixed identifiers to the entry."""
+    for device_id in (PLC_ID, DEVICE_HEATING_ID, DEVICE_VENTILATION_ID):
+        device = device_registry.async_get_device(identifiers={(DOMAIN, device_id)})
+        if device is None or entry.entry_id not in device.config_entries:
+            continue
+        device_registry.async_update_device(
+            device.id, new_identifiers={device_identifier(entry.entry_id, device_id)}
+        )
+
+
+async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changes to the entry in place, without reloading it.
+
+    The API, coordinator and entities stay up, only what changed is touched.
+    """
+    helper: AmitApiHelper = hass.data[DOMAIN][entry.entry_id]
+    manager = async_get_connection_manager(hass)
+
+    if entry.options != helper.options:
+        helper.options = dict(entry.options)
+        manager.async_update(entry)
+        helper.api.apply_options(entry.options)
+        helper.coordinator.async_update_options(entry.options)
+
+        platforms = _entry_platforms(entry)
+        if removed := [p for p in helper.platforms if p not in platforms]:
+            await hass.config_entries.async_unload_platforms(entry, removed)
+        if added := [p for p in platforms if p not in helper.platforms]:
+            await hass.config_entries.async_forward_entry_setups(entry, added)
+        helper.platforms = platforms
+
+    config = helper.api.config
+    if (config.url, config.username, config.password) != (
+        entry.data[CONF_HOST],
+        entry.data[CONF_USERNAME],
+        entry.data[CONF_PASSWORD],
+    ):
+        manager.async_unregister(entry)
+        await helper.api.async_reconfigure(entry, manager.async_register(entry))
+        await helper.coordinator.async_reload_data()
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the data saved for a config entry."""
+    await snapshot_store(hass, entry.entry_id).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+    helper: AmitApiHelper = hass.data[DOMAIN][entry.entry_id]
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, helper.platforms
+    ):
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
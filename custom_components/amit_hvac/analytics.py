@@ -0,0 +1,118 @@
+"""Analytics derived from PLC readings.
+
+Every tracker keeps a constant amount of running state and is updated once
+per coordinator update, nothing is recomputed over the reading history.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+import math
+from typing import TYPE_CHECKING
+
+from amit_hvac_control.models import VentilationMode
+
+from .const import ANALYTICS_TIME_CONSTANT, DUTY_CYCLE_TIME_CONSTANT
+
+if TYPE_CHECKING:
+    from .coordinator import AmitHvacData
+
+
+def _smoothing(elapsed: float, time_constant: float) -> float:
+    """Return the weight of a new sample in a time-weighted moving average."""
+    return 1 - math.exp(-elapsed / time_constant)
+
+
+class RateTracker:
+    """Exponentially smoothed rate of change of a reading, per second."""
+
+    def __init__(self, time_constant: float) -> None:
+        """Initialize the tracker."""
+        self.time_constant = time_constant
+        self.rate: float | None = None
+        self._last: tuple[float, float] | None = None
+
+    def update(self, timestamp: float, value: float | None) -> None:
+        """Add a reading."""
+        if value is None:
+            return
+        if self._last is not None and (elapsed := timestamp - self._last[0]) > 0:
+            rate = (value - self._last[1]) / elapsed
+            if self.rate is None:
+                self.rate = rate
+            else:
+                self.rate += _smoothing(elapsed, self.time_constant) * (
+                    rate - self.rate
+                )
+        self._last = (timestamp, value)
+
+
+class DutyCycle:
+    """Exponentially smoothed share of time a binary state was on."""
+
+    def __init__(self, time_constant: float) -> None:
+        """Initialize the tracker."""
+        self.time_constant = time_constant
+        self.duty: float | None = None
+        self._last: tuple[float, bool] | None = None
+
+    def update(self, timestamp: float, on: bool) -> None:
+        """Add a reading, the previous state is assumed to have held until now."""
+        if self._last is not None and (elapsed := timestamp - self._last[0]) > 0:
+            was_on = float(self._last[1])
+            if self.duty is None:
+                self.duty = was_on
+            else:
+                self.duty += _smoothing(elapsed, self.time_constant) * (
+                    was_on - self.duty
+                )
+        self._last = (timestamp, on)
+
+
+class RunTimeCounter:
+    """Seconds spent in each state."""
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self.seconds: defaultdict[VentilationMode, float] = defaultdict(float)
+        self._last: tuple[float, VentilationMode] | None = None
+
+    def update(self, timestamp: float, state: VentilationMode) -> None:
+        """Add a reading, the previous state is assumed to have held until now."""
+        if self._last is not None and (elapsed := timestamp - self._last[0]) > 0:
+            self.seconds[self._last[1]] += elapsed
+        self._last = (timestamp, state)
+
+
+class AmitAnalytics:
+    """Analytics of one PLC, fed from the ventilation page."""
+
+    def __init__(self) -> None:
+        """Initialize the analytics."""
+        self.co2_rate = RateTracker(ANALYTICS_TIME_CONSTANT)
+        self.air_temperature_rate = RateTracker(ANALYTICS_TIME_CONSTANT)
+        self.heating_duty_cycle = DutyCycle(DUTY_CYCLE_TIME_CONSTANT)
+        self.fan_run_time = RunTimeCounter()
+
+    def update(self, timestamp: float, data: AmitHvacData) -> None:
+        """Add freshly read ventilation data."""
+        ventilation = data.ventilation
+        self.co2_rate.update(timestamp, ventilation.co2_current)
+        self.air_temperature_rate.update(timestamp, ventilation.air_temp_current)
+        self.heating_duty_cycle.update(timestamp, ventilation.heating_on)
+        self.fan_run_time.update(timestamp, ventilation.ventilation_mode)
+
+    def time_to_setpoint(self, data: AmitHvacData) -> float | None:
+        """Return the seconds until the air reaches its setpoint at the current rate.
+
+        None while the air temperature is not moving towards the setpoint.
+        """
+        rate = self.air_temperature_rate.rate
+        current = data.ventilation.air_temp_current
+        setpoint = data.ventilation.air_temp_setpoint
+        if rate is None or current is None or setpoint is None:
+            return None
+        if math.isclose(current, setpoint, abs_tol=0.05):
+            return 0
+        remaining = (setpoint - current) / rate if rate else -1
+        return remaining if remaining > 0 else None
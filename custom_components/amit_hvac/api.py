@@ -1,41 +1,505 @@
 """Amit API."""
 
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Mapping
+import contextlib
+from http import HTTPStatus
+import logging
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientResponseError,
+    ClientSession,
+    ServerDisconnectedError,
+)
+
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.importlib import async_import_module
+
+from amit_hvac_control.models import Config, HeatingMode, Season, VentilationMode
+
+from .breaker import CircuitBreaker
+from .bulk import PAGES, BulkParseError, ParseCache
+from .connection import AmitConnection
+from .const import (
+    BULK_READ_FAILURE_THRESHOLD,
+    CONF_BULK_READ,
+    DEFAULT_BULK_READ,
+    PARSE_CACHE_SIZE,
+    WRITE_COOLDOWN,
+)
+from .metrics import PlcMetrics
+from .scheduler import RequestPreempted, RequestPriority
+from .session import async_authenticate, async_create_plc_session, async_take_login
+
+if TYPE_CHECKING:
+    from amit_hvac_control.api.status import StatusApi
+    from amit_hvac_control.api.temperature import TemperatureApi
+    from amit_hvac_control.api.ventilation import VentilationApi
+
+_LOGGER = logging.getLogger(__name__)
 
-from amit_hvac_control.client import AmitHvacControlClient
-from amit_hvac_control.models import Config, VentilationMode
+_T = TypeVar("_T")
+
+# A queued write: its value, the request sending it and the caller's future
+_PendingWrite = tuple[Any, Callable[[], Awaitable[Any]], asyncio.Future[Any]]
+
+REGISTER_VENTILATION_MODE = "ventilation_mode"
+REGISTER_TARGET_AIR_TEMPERATURE = "target_air_temperature"
+REGISTER_TARGET_CO2 = "target_co2"
+REGISTER_HEATING_MODE = "heating_mode"
+REGISTER_TEMPERATURE = "temperature"
+REGISTER_MINIMAL_TEMPERATURE = "minimal_temperature"
+REGISTER_SEASON = "season"
+
+# Order in which a scene is written: the season and heating mode before the
+# setpoints, and the ventilation mode last so the unit starts on the new ones.
+SCENE_ORDER = (
+    REGISTER_SEASON,
+    REGISTER_HEATING_MODE,
+    REGISTER_TARGET_AIR_TEMPERATURE,
+    REGISTER_TARGET_CO2,
+    REGISTER_VENTILATION_MODE,
+)
 
 
 class AmitApi:
-    """Amit API."""
+    """Amit API.
+
+    Owns a single long-lived session per config entry. The session is opened and
+    authenticated lazily on the first request, reuses Home Assistant's shared
+    connection pool and logs in again transparently when the PLC drops it. The
+    number of requests in flight per host is capped by the shared connection
+    since the PLC web server is small, and slots go to writes first, then to
+    the reads verifying them, then to polls.
+    Every request is recorded in `metrics`, and requests fail fast while the
+    `breaker` considers the PLC unreachable. A session the config flow just
+    authenticated is taken over instead of logging in again.
+
+    Reads go through `async_read`. In bulk read mode the raw pages are fetched
+    and only the values the integration uses are extracted, falling back for
+    good to a full HTML parse of the pages once a page is not understood several
+    reads in a row. A page that is byte for byte the same as a recent one is not
+    parsed again, its earlier result object is returned as is. The library is
+    only imported once needed, by a write or such a fallback.
+
+    Writes are queued per register and the first one is sent at once. Writes
+    arriving within WRITE_COOLDOWN seconds of a flush are coalesced: a burst to
+    the same register keeps only the last value, and writes to different
+    registers are flushed together. Each flush is followed by a single
+    notification to the write listeners with the values that were written,
+    which runs on its own so writes queued meanwhile are not held up.
+    """
 
-    def __init__(self, entry: ConfigEntry) -> None:
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, connection: AmitConnection
+    ) -> None:
         """Construct the API."""
-        host = entry.data["host"]
-        username = entry.data["username"]
-        password = entry.data["password"]
-        self.config = Config(host, username, password)
+        self.hass = hass
+        self.config = _entry_config(entry)
+        self.connection = connection
+        self.metrics = PlcMetrics()
+        self.breaker = CircuitBreaker(f"PLC at {self.config.url}")
+        self._bulk_failures: Counter[str] = Counter()
+        self.apply_options(entry.options)
+        self._parse_cache = ParseCache(PARSE_CACHE_SIZE)
+
+        self._session: ClientSession | None = None
+        self._status_api: StatusApi | None = None
+        self._temperature_api: TemperatureApi | None = None
+        self._ventilation_api: VentilationApi | None = None
+        self._logged_in = False
+        self._login_lock = asyncio.Lock()
+        self._async_take_login()
+
+        self._pending_writes: dict[str, _PendingWrite] = {}
+        self._write_listeners: list[Callable[[dict[str, Any]], Awaitable[None]]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        self._next_flush = 0.0
+
+    async def _async_login(self) -> None:
+        """Open the shared session if needed and authenticate against the PLC."""
+        async with self._login_lock:
+            if self._logged_in:
+                return
+
+            if self._session is None:
+                self._async_create_session()
+            else:
+                self._session.cookie_jar.clear()
+
+            _LOGGER.debug("Logging in to %s", self.config.url)
+            await async_authenticate(self._session, self.metrics)
+            self._logged_in = True
+
+    @callback
+    def _async_take_login(self) -> None:
+        """Take over the session handed over for this PLC, if any."""
+        if (login := async_take_login(self.hass, self.config)) is None:
+            return
+        self.metrics = login.metrics
+        self._session = login.session
+        self._logged_in = True
+
+    @callback
+    def _async_create_session(self) -> ClientSession:
+        """Create the session shared by every request."""
+        self._session = async_create_plc_session(self.hass, self.config, self.metrics)
+        return self._session
+
+    async def _async_load_page_apis(self) -> None:
+        """Import the page-based library API and bind it to the session."""
+        if self._status_api is not None:
+            return
+        status, temperature, ventilation = [
+            await async_import_module(self.hass, f"amit_hvac_control.api.{name}")
+            for name in ("status", "temperature", "ventilation")
+        ]
+        session = self._session or self._async_create_session()
+        self._status_api = status.StatusApi(session)
+        self._temperature_api = temperature.TemperatureApi(session)
+        self._ventilation_api = ventilation.VentilationApi(session)
+
+    async def _async_request(
+        self,
+        request: Callable[[], Awaitable[_T]],
+        priority: RequestPriority = RequestPriority.POLL,
+    ) -> _T:
+        """Run a request on the shared session, logging in again if it expired."""
+        async with self.connection.async_request_slot(priority):
+            await self.breaker.async_before_request()
+            try:
+                result = await self._async_request_with_relogin(request)
+            except asyncio.CancelledError:
+                self.breaker.record_cancelled()
+                raise
+            except Exception as err:
+                self.metrics.failed_operations += 1
+                if isinstance(err, TimeoutError):
+                    self.metrics.timeouts += 1
+                if _is_unreachable(err):
+                    self.breaker.record_failure(err)
+                else:
+                    # The PLC answered, even if not with what was expected
+                    self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def _async_request_with_relogin(
+        self, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Run a request, retrying once after logging in again."""
+        await self._async_login()
+        try:
+            return await request()
+        except ClientResponseError as err:
+            if err.status != HTTPStatus.UNAUTHORIZED:
+                raise
+            _LOGGER.debug("PLC session expired, logging in again")
+        except ServerDisconnectedError:
+            _LOGGER.debug("PLC closed the connection, retrying")
+
+        self.metrics.relogins += 1
+        self._logged_in = False
+        await self._async_login()
+        return await request()
+
+    def async_add_write_listener(
+        self, listener: Callable[[dict[str, Any]], Awaitable[None]]
+    ) -> Callable[[], None]:
+        """Listen for flushed write bursts, returns a function to remove it."""
+        self._write_listeners.append(listener)
+        return lambda: self._write_listeners.remove(listener)
+
+    async def _async_write(
+        self, register: str, value: Any, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Queue a write, superseding any pending write to the same register."""
+        self.breaker.check()
+        await self._async_load_page_apis()
+        if register in self._pending_writes:
+            _, _, future = self._pending_writes[register]
+            _LOGGER.debug("Coalescing pending write to %s", register)
+        else:
+            future = self.hass.loop.create_future()
+        self._pending_writes[register] = (value, request, future)
 
-    def create_client(self):
-        """Create client."""
-        return AmitHvacControlClient(self.config)
+        if self._flush_task is None:
+            self._flush_task = self.hass.async_create_task(
+                self._async_flush_writes(), "amit_hvac write flush"
+            )
+        return await asyncio.shield(future)
+
+    async def _async_flush_writes(self) -> None:
+        """Send queued writes until none are left, one flush per cooldown."""
+        try:
+            while self._pending_writes:
+                if (delay := self._next_flush - self.hass.loop.time()) > 0:
+                    await asyncio.sleep(delay)
+                pending, self._pending_writes = self._pending_writes, {}
+                written = await self._async_send_writes(pending)
+                self._next_flush = self.hass.loop.time() + WRITE_COOLDOWN
+                if written:
+                    self.hass.async_create_task(
+                        self._async_notify_write_listeners(written),
+                        "amit_hvac write listeners",
+                    )
+        finally:
+            self._flush_task = None
+
+    async def _async_send_writes(
+        self, pending: dict[str, _PendingWrite]
+    ) -> dict[str, Any]:
+        """Send a batch of writes, resolving their futures, return what was written."""
+        _LOGGER.debug("Flushing writes to %s", ", ".join(pending))
+        written: dict[str, Any] = {}
+        try:
+            # The session may have been replaced since the writes were queued
+            await self._async_load_page_apis()
+            for register, (value, request, future) in pending.items():
+                try:
+                    result = await self._async_request(request, RequestPriority.WRITE)
+                except Exception as err:  # pylint: disable=broad-except
+                    future.set_exception(err)
+                else:
+                    future.set_result(result)
+                    written[register] = value
+        finally:
+            _fail_writes(pending, "The PLC connection was closed")
+        return written
+
+    async def _async_notify_write_listeners(self, written: dict[str, Any]) -> None:
+        """Tell the write listeners which values were written."""
+        for listener in self._write_listeners:
+            await listener(written)
+
+    def apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply the read options of the entry."""
+        self.bulk_read = options.get(CONF_BULK_READ, DEFAULT_BULK_READ)
+        self._bulk_failures.clear()
+
+    async def async_reconfigure(
+        self, entry: ConfigEntry, connection: AmitConnection
+    ) -> None:
+        """Switch to the host and credentials of the entry, keeping queued writes.
+
+        The next request uses a session handed over for the new PLC, or logs in.
+        """
+        async with self._login_lock:
+            self._async_release_session()
+            self.config = _entry_config(entry)
+            self.connection = connection
+            self.breaker = CircuitBreaker(f"PLC at {self.config.url}")
+            self._async_take_login()
+
+    async def async_close(self) -> None:
+        """Fail the queued writes and release the session."""
+        if (flush_task := self._flush_task) is not None:
+            flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await flush_task
+        pending, self._pending_writes = self._pending_writes, {}
+        _fail_writes(pending, "The PLC connection was closed")
+        self._async_release_session()
+
+    @callback
+    def _async_release_session(self) -> None:
+        """Detach the session, the connector is shared with Home Assistant."""
+        self._logged_in = False
+        if self._session is not None:
+            self._session.detach()
+            self._session = None
+            self._status_api = None
+            self._temperature_api = None
+            self._ventilation_api = None
 
     async def async_set_ventilation(self, ventilation_mode: VentilationMode):
         """Set ventilation mode."""
-        async with AmitHvacControlClient(self.config) as client:
-            return await client.ventilation_api.async_set_ventilation(ventilation_mode)
+        return await self._async_write(
+            REGISTER_VENTILATION_MODE,
+            ventilation_mode,
+            lambda: self._ventilation_api.async_set_ventilation(ventilation_mode),
+        )
+
+    async def async_set_target_air_temperature(self, temperature: float):
+        """Set target air temperature."""
+        return await self._async_write(
+            REGISTER_TARGET_AIR_TEMPERATURE,
+            temperature,
+            lambda: self._ventilation_api.async_set_target_air_temperature(temperature),
+        )
+
+    async def async_set_target_co2(self, co2: float):
+        """Set target CO2."""
+        return await self._async_write(
+            REGISTER_TARGET_CO2,
+            co2,
+            lambda: self._ventilation_api.async_set_target_co2(co2),
+        )
+
+    async def async_set_heating_mode(self, heating_mode: HeatingMode):
+        """Set heating mode."""
+        return await self._async_write(
+            REGISTER_HEATING_MODE,
+            heating_mode,
+            lambda: self._temperature_api.async_set_heading_mode(heating_mode),
+        )
+
+    async def async_set_temperature(self, temperature: float):
+        """Set comfort temperature."""
+        return await self._async_write(
+            REGISTER_TEMPERATURE,
+            temperature,
+            lambda: self._temperature_api.async_set_temperature(temperature),
+        )
+
+    async def async_set_minimal_temperature(self, temperature: float):
+        """Set minimal temperature."""
+        return await self._async_write(
+            REGISTER_MINIMAL_TEMPERATURE,
+            temperature,
+            lambda: self._temperature_api.async_set_minimal_temperature(temperature),
+        )
 
-    async def async_get_data(self):
+    async def async_set_season(self, season: Season):
+        """Set season."""
+        return await self._async_write(
+            REGISTER_SEASON,
+            season,
+            lambda: self._temperature_api.async_set_season(season),
+        )
+
+    async def async_apply_scene(self, values: dict[str, Any]) -> None:
+        """Write several registers in one flush, in SCENE_ORDER.
+
+        The write listeners are notified once, so the scene is verified with a
+        single read of the pages it touched.
+        """
+        setters: dict[str, Callable[[Any], Awaitable[Any]]] = {
+            REGISTER_SEASON: self.async_set_season,
+            REGISTER_HEATING_MODE: self.async_set_heating_mode,
+            REGISTER_TARGET_AIR_TEMPERATURE: self.async_set_target_air_temperature,
+            REGISTER_TARGET_CO2: self.async_set_target_co2,
+            REGISTER_VENTILATION_MODE: self.async_set_ventilation,
+        }
+        registers = [register for register in SCENE_ORDER if register in values]
+        # Queue every write before the first flush can start
+        await self._async_load_page_apis()
+        results = await asyncio.gather(
+            *(setters[register](values[register]) for register in registers),
+            return_exceptions=True,
+        )
+        failed = {
+            register: result
+            for register, result in zip(registers, results, strict=True)
+            if isinstance(result, Exception)
+        }
+        if failed:
+            raise HomeAssistantError(
+                "Could not write "
+                + ", ".join(f"{register} ({err})" for register, err in failed.items())
+            )
+
+    async def async_read(
+        self, datasets: list[str], priority: RequestPriority = RequestPriority.POLL
+    ) -> dict[str, Any]:
+        """Read datasets concurrently, mapping each to its result or error."""
+        results = await asyncio.gather(
+            *(self._async_read_dataset(dataset, priority) for dataset in datasets),
+            return_exceptions=True,
+        )
+        self.metrics.preempted += sum(
+            isinstance(result, RequestPreempted) for result in results
+        )
+        return dict(zip(datasets, results, strict=True))
+
+    async def _async_read_dataset(self, dataset: str, priority: RequestPriority) -> Any:
+        """Read a dataset, in bulk if enabled."""
+        if self.bulk_read:
+            url = PAGES[dataset][0]
+            content = await self._async_request(
+                lambda: self._async_get_page(url), priority
+            )
+            try:
+                result, cached = self._parse_cache.parse(dataset, content)
+            except BulkParseError as err:
+                # A page caught mid-update by the PLC can be garbled once
+                self._bulk_failures[dataset] += 1
+                if self._bulk_failures[dataset] < BULK_READ_FAILURE_THRESHOLD:
+                    _LOGGER.debug("The %s page is not understood: %s", dataset, err)
+                else:
+                    _LOGGER.warning(
+                        "Disabling bulk read, the %s page is not understood: %s",
+                        dataset,
+                        err,
+                    )
+                    self.bulk_read = False
+                    self._parse_cache.clear()
+            else:
+                self._bulk_failures.pop(dataset, None)
+                if cached:
+                    self.metrics.parse_cache_hits += 1
+                else:
+                    self.metrics.parse_cache_misses += 1
+                return result
+
+        fallback = await async_import_module(self.hass, f"{__package__}.fallback")
+        url = PAGES[dataset][0]
+        content = await self._async_request(lambda: self._async_get_page(url), priority)
+        return fallback.PARSERS[dataset](content)
+
+    async def _async_get_page(self, url: str) -> bytes:
+        """Get the raw content of a page."""
+        async with self._session.get(url) as response:
+            return await response.read()
+
+    async def async_get_data(self, priority: RequestPriority = RequestPriority.POLL):
         """Get data."""
-        async with AmitHvacControlClient(self.config) as client:
-            return await client.status_api.async_get_overview()
+        await self._async_load_page_apis()
+        return await self._async_request(
+            lambda: self._status_api.async_get_overview(), priority
+        )
 
-    async def async_get_heating_data(self):
+    async def async_get_heating_data(
+        self, priority: RequestPriority = RequestPriority.POLL
+    ):
         """Get heating data."""
-        async with AmitHvacControlClient(self.config) as client:
-            return await client.temperature_api.async_get_data()
+        await self._async_load_page_apis()
+        return await self._async_request(
+            lambda: self._temperature_api.async_get_data(), priority
+        )
 
-    async def async_get_ventilation_data(self):
+    async def async_get_ventilation_data(
+        self, priority: RequestPriority = RequestPriority.POLL
+    ):
         """Get ventilation data."""
-        async with AmitHvacControlClient(self.config) as client:
-            return await client.ventilation_api.async_get_data()
+        await self._async_load_page_apis()
+        return await self._async_request(
+            lambda: self._ventilation_api.async_get_data(), priority
+        )
+
+
+def _fail_writes(pending: dict[str, _PendingWrite], reason: str) -> None:
+    """Fail the writes of a batch that were not sent."""
+    for _, _, future in pending.values():
+        if not future.done():
+            future.set_exception(HomeAssistantError(reason))
+
+
+def _entry_config(entry: ConfigEntry) -> Config:
+    """Return the PLC connection settings of a config entry."""
+    return Config(entry.data["host"], entry.data["username"], entry.data["password"])
+
+
+def _is_unreachable(err: Exception) -> bool:
+    """Return whether an error means the PLC could not be reached."""
+    if isinstance(err, ClientResponseError):
+        return err.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+    return isinstance(err, ClientConnectionError | TimeoutError)
@@ -1,9 +1,12 @@
 """API helper."""
 
+from typing import Any
+
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
 from .api import AmitApi
-from .coordinator import AmitFanCoordinator
+from .coordinator import AmitHvacCoordinator
 
 
 class AmitApiHelper:
@@ -13,11 +16,14 @@ class AmitApiHelper:
         """Construct Amit data helper object."""
         self.hass = hass
         self.api = api
-        self._ventilation_coordinator = None
+        self._coordinator = None
+        self.platforms: list[Platform] = []
+        # The entry options the API, coordinator and platforms were set up with
+        self.options: dict[str, Any] = {}
 
     @property
-    def ventilation_coordinator(self):
-        """Get ventilation coordinator."""
-        if self._ventilation_coordinator is None:
-            self._ventilation_coordinator = AmitFanCoordinator(self.hass, self.api)
-        return self._ventilation_coordinator
+    def coordinator(self) -> AmitHvacCoordinator:
+        """Get HVAC coordinator."""
+        if self._coordinator is None:
+            self._coordinator = AmitHvacCoordinator(self.hass, self.api)
+        return self._coordinator
@@ -0,0 +1,134 @@
+"""Circuit breaker for the Amit PLC."""
+
+from __future__ import annotations
+
+import asyncio
+from enum import StrEnum
+import logging
+import random
+import time
+from typing import Any
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import (
+    BREAKER_BASE_BACKOFF,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_BACKOFF,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BreakerState(StrEnum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class PlcUnavailable(HomeAssistantError):
+    """Error to indicate the PLC is unreachable and requests are not sent."""
+
+
+class CircuitBreaker:
+    """Stop talking to a PLC that does not answer.
+
+    Trips after `BREAKER_FAILURE_THRESHOLD` consecutive failures, then fails
+    requests at once until a backoff elapses. The backoff doubles with every
+    failed probe up to `BREAKER_MAX_BACKOFF`, with jitter so several PLCs do
+    not probe in lockstep. The first request after the backoff is let through
+    as a probe, requests arriving meanwhile wait for its outcome. A successful
+    probe closes the breaker again.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize the breaker."""
+        self.name = name
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at: float | None = None
+        self.last_error: str | None = None
+        self._probe_done: asyncio.Event | None = None
+
+    def check(self) -> None:
+        """Raise PlcUnavailable while requests must not be sent."""
+        if self.state is BreakerState.CLOSED:
+            return
+        if self.state is BreakerState.OPEN and time.monotonic() >= self.retry_at:
+            return
+        retry_in = max(0, self.retry_at - time.monotonic())
+        raise PlcUnavailable(
+            f"{self.name} is unreachable ({self.last_error}), retrying in {retry_in:.0f}s"
+        )
+
+    async def async_before_request(self) -> None:
+        """Check a request may be sent, letting it through as probe if due."""
+        while self._probe_done is not None:
+            await self._probe_done.wait()
+        self.check()
+        if self.state is BreakerState.OPEN:
+            _LOGGER.debug("Probing %s", self.name)
+            self.state = BreakerState.HALF_OPEN
+            self._probe_done = asyncio.Event()
+
+    def _end_probe(self) -> None:
+        """Release the requests waiting for a probe."""
+        if self._probe_done is not None:
+            self._probe_done.set()
+            self._probe_done = None
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        if self.state is not BreakerState.CLOSED:
+            _LOGGER.info("%s is reachable again", self.name)
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = None
+        self._end_probe()
+
+    def record_cancelled(self) -> None:
+        """Let the next request probe again when a probe was cancelled."""
+        if self.state is BreakerState.HALF_OPEN:
+            self.state = BreakerState.OPEN
+        self._end_probe()
+
+    def record_failure(self, err: Exception) -> None:
+        """Count a failed request, tripping the breaker when needed."""
+        self.failures += 1
+        self.last_error = str(err) or type(err).__name__
+        if self.state is BreakerState.OPEN or (
+            self.state is BreakerState.CLOSED
+            and self.failures < BREAKER_FAILURE_THRESHOLD
+        ):
+            return
+
+        self.trips += 1
+        backoff = min(
+            BREAKER_BASE_BACKOFF * 2 ** (self.trips - 1), BREAKER_MAX_BACKOFF
+        ) * random.uniform(0.5, 1)
+        self.retry_at = time.monotonic() + backoff
+        if self.state is BreakerState.CLOSED:
+            _LOGGER.warning(
+                "%s is unreachable (%s), pausing requests", self.name, self.last_error
+            )
+        _LOGGER.debug("Next probe of %s in %.1fs", self.name, backoff)
+        self.state = BreakerState.OPEN
+        self._end_probe()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_in": (
+                None
+                if self.retry_at is None
+                else max(0, self.retry_at - time.monotonic())
+            ),
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,173 @@
+"""Lightweight parsers for bulk reads of the Amit PLC pages.
+
+Extract only the values the integration uses straight from the raw page bytes
+with precompiled patterns, instead of building a full HTML tree per page like
+the page-based `amit_hvac_control` calls do. A reading whose element is missing,
+on a unit without that probe, is None, a page without its modes is not
+understood.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+from hashlib import blake2b
+import re
+from typing import Any
+
+from amit_hvac_control.models import HeatingMode, Season, VentilationMode
+
+from .results import DataResult, TemperatureResult, VentilationResult
+
+# The pages read by amit_hvac_control
+MAIN_URL = "/pages/index.hta"
+HEATING_URL = "/pages/page00/Vytapeni.hta"
+VENTILATION_URL = "/pages/page00/Page002.hta"
+
+
+class BulkParseError(ValueError):
+    """Error to indicate a page does not look like the parsers expect."""
+
+
+def _view_pattern(name: str) -> re.Pattern[bytes]:
+    """Return a pattern capturing the text of the element with a class."""
+    return re.compile(
+        rb'class="(?:[^"]*\s)?' + name.encode() + rb'(?:-alert-max)?(?:\s[^"]*)?"'
+        rb"[^>]*>\s*([^<\s]+)"
+    )
+
+
+def _input_pattern(name: str) -> re.Pattern[bytes]:
+    """Return a pattern capturing the input element with a class."""
+    return re.compile(
+        rb'<input\b[^>]*\bclass="(?:[^"]*\s)?' + name.encode() + rb'(?:\s[^"]*)?"[^>]*>'
+    )
+
+
+_INPUT_VALUE = re.compile(rb'\bvalue="([^"]*)"')
+_VIEW = {index: _view_pattern(f"AWNumericView{index}") for index in (1, 2, 3)}
+_EDIT = {index: _input_pattern(f"AWNumericEditButton{index}") for index in (1, 2)}
+_CASE_LABELS = re.compile(rb"AWSCaseLabel(\d)v=(\d)")
+_CASE_IMAGE = re.compile(rb"AWSCaseImage1v=(\d)")
+_VENTILATION_MODE = re.compile(rb"AWSCaseLabel1v=(\d)")
+_PROGRESS_BAR = re.compile(rb"AWProgressBar1v=(\d+.\d+)")
+_BITS = re.compile(rb"AWSCaseLabelBit(\d)_.*\((\d+)&(\d+)\)")
+
+
+def _search(pattern: re.Pattern[bytes], content: bytes) -> re.Match[bytes]:
+    """Return the first match of a pattern, raising BulkParseError if none."""
+    if (match := pattern.search(content)) is None:
+        raise BulkParseError(f"No match for {pattern.pattern!r}")
+    return match
+
+
+def _view(content: bytes, index: int) -> float | None:
+    """Return the value shown by a numeric view, None if the page has none."""
+    if (match := _VIEW[index].search(content)) is None:
+        return None
+    return float(match.group(1))
+
+
+def _edit(content: bytes, index: int) -> float | None:
+    """Return the value of a numeric edit input, None if the page has none."""
+    if (match := _EDIT[index].search(content)) is None:
+        return None
+    return float(_search(_INPUT_VALUE, match.group(0)).group(1))
+
+
+def parse_overview(content: bytes) -> DataResult:
+    """Parse the overview page."""
+    labels = {key: int(value) for key, value in _CASE_LABELS.findall(content)}
+    try:
+        co_2 = _view(content, 2)
+        return DataResult(
+            temperature=_view(content, 1),
+            air_temperature=_view(content, 3),
+            co_2=None if co_2 is None else int(co_2),
+            ventilation_mode=VentilationMode(labels[b"2"]),
+            season=Season(labels[b"1"]),
+            heating_mode=HeatingMode(labels[b"3"]),
+        )
+    except (KeyError, ValueError) as err:
+        raise BulkParseError(f"Unexpected overview page: {err}") from err
+
+
+def parse_heating(content: bytes) -> TemperatureResult:
+    """Parse the heating page."""
+    try:
+        return TemperatureResult(
+            _view(content, 1),
+            _view(content, 2),
+            HeatingMode(int(_search(_CASE_IMAGE, content).group(1))),
+        )
+    except ValueError as err:
+        raise BulkParseError(f"Unexpected heating page: {err}") from err
+
+
+def parse_ventilation(content: bytes) -> VentilationResult:
+    """Parse the ventilation page."""
+    bits = {
+        int(key): int(value) & int(mask) > 0
+        for key, value, mask in _BITS.findall(content)
+    }
+    speed = VentilationMode.OFF
+    for bit, mode in (
+        (2, VentilationMode.LOW),
+        (3, VentilationMode.MEDIUM),
+        (4, VentilationMode.HIGH),
+    ):
+        if bits.get(bit):
+            speed = mode
+            break
+    try:
+        heating_level = float(_search(_PROGRESS_BAR, content).group(1))
+        return VentilationResult(
+            VentilationMode(int(_search(_VENTILATION_MODE, content).group(1))),
+            speed,
+            _view(content, 1),
+            _edit(content, 2),
+            _view(content, 2),
+            _edit(content, 1),
+            heating_level,
+            heating_level > 0,
+        )
+    except ValueError as err:
+        raise BulkParseError(f"Unexpected ventilation page: {err}") from err
+
+
+# The page and parser of each coordinator dataset
+PAGES: dict[str, tuple[str, Callable[[bytes], Any]]] = {
+    "overview": (MAIN_URL, parse_overview),
+    "heating": (HEATING_URL, parse_heating),
+    "ventilation": (VENTILATION_URL, parse_ventilation),
+}
+
+
+class ParseCache:
+    """Results of the most recently parsed pages, keyed by a hash of their bytes.
+
+    A page that is byte for byte the same as one parsed before yields the very
+    same result object, so callers can tell an unchanged page by identity.
+    Results are shared between reads and must not be modified.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize the cache."""
+        self.size = size
+        self._results: OrderedDict[tuple[str, bytes], Any] = OrderedDict()
+
+    def parse(self, dataset: str, content: bytes) -> tuple[Any, bool]:
+        """Return the result of a dataset page and whether it came from the cache."""
+        key = (dataset, blake2b(content, digest_size=16).digest())
+        if (result := self._results.get(key)) is not None:
+            self._results.move_to_end(key)
+            return result, True
+        result = PAGES[dataset][1](content)
+        self._results[key] = result
+        if len(self._results) > self.size:
+            self._results.popitem(last=False)
+        return result, False
+
+    def clear(self) -> None:
+        """Forget every parsed page."""
+        self._results.clear()
@@ -1,4 +1,5 @@
 """Platform for sensor integration."""
+
 from __future__ import annotations
 
 from typing import Any
@@ -19,16 +20,15 @@ from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from amit_hvac_control.api.status import DataResult
-from amit_hvac_control.api.ventilation import VentilationResult
 from amit_hvac_control.models import HeatingMode, Season, VentilationMode
 
 from .api import AmitApi
 from .api_helper import AmitApiHelper
 from .const import DEVICE_HEATING_ID, DEVICE_VENTILATION_ID, DOMAIN
-from .coordinator import AmitFanCoordinator
+from .coordinator import AmitHvacCoordinator
+from .entity import AmitEntity
+from .results import DataResult, TemperatureResult, VentilationResult
 
 FAN_MODE_MAP = {
     FAN_OFF: VentilationMode.OFF,
@@ -37,6 +37,16 @@ FAN_MODE_MAP = {
     FAN_HIGH: VentilationMode.HIGH,
     FAN_AUTO: VentilationMode.AUTO,
 }
+FAN_MODE_BY_VENTILATION_MODE = {mode: fan for fan, mode in FAN_MODE_MAP.items()}
+
+HVAC_MODE_BY_HEATING_MODE = {
+    HeatingMode.SCHEDULED: HVACMode.AUTO,
+    HeatingMode.COMFORT: HVACMode.HEAT,
+    HeatingMode.MINIMAL: HVACMode.OFF,
+}
+HEATING_MODE_BY_HVAC_MODE = {
+    hvac_mode: mode for mode, hvac_mode in HVAC_MODE_BY_HEATING_MODE.items()
+}
 
 
 async def async_setup_entry(
@@ -46,20 +56,18 @@ async def async_setup_entry(
 
     helper: AmitApiHelper = hass.data[DOMAIN][entry.entry_id]
 
-    ventilation_coordinator = helper.ventilation_coordinator
+    coordinator = helper.coordinator
     api = helper.api
 
-    await ventilation_coordinator.async_config_entry_first_refresh()
-
     async_add_entities(
         [
-            AmitHeatingClimateEntity(api, entry.entry_id),
-            AmitVentilationClimateEntity(api, ventilation_coordinator, entry.entry_id),
+            AmitHeatingClimateEntity(api, coordinator, entry.entry_id),
+            AmitVentilationClimateEntity(api, coordinator, entry.entry_id),
         ]
     )
 
 
-class AmitHeatingClimateEntity(ClimateEntity):
+class AmitHeatingClimateEntity(AmitEntity, ClimateEntity):
     """Amit Heating Climate entity. Used to control heating."""
 
     _enable_turn_on_off_backwards_compatibility = False
@@ -73,69 +81,72 @@ class AmitHeatingClimateEntity(ClimateEntity):
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
     _attr_has_entity_name = True
     _attr_name = None
+    _datasets = frozenset({"heating"})
 
-    def __init__(self, api: AmitApi, entry_id: str) -> None:
+    def __init__(
+        self, api: AmitApi, coordinator: AmitHvacCoordinator, entry_id: str
+    ) -> None:
         """Construct climate entity."""
+        super().__init__(coordinator)
         self.api = api
         self._attr_unique_id = f"{entry_id}-heating"
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self._is_update_irrelevant():
+            return
+        heating_data: TemperatureResult = self.coordinator.data.heating
+
+        self._attr_hvac_mode = HVAC_MODE_BY_HEATING_MODE[heating_data.heating_mode]
+        self._attr_current_temperature = heating_data.actual_temperature
+        self._attr_target_temperature = heating_data.set_temperature
+
+        self._async_write_if_changed()
+
+    def _published_state(self) -> tuple:
+        """Return the values this entity publishes."""
+        return (
+            self.available,
+            self._attr_hvac_mode,
+            self._attr_current_temperature,
+            self._attr_target_temperature,
+        )
+
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
-        if hvac_mode == HVACMode.OFF:
-            mode = HeatingMode.MINIMAL
-        elif hvac_mode == HVACMode.AUTO:
-            mode = HeatingMode.SCHEDULED
-        else:
-            mode = HeatingMode.COMFORT
+        mode = HEATING_MODE_BY_HVAC_MODE[hvac_mode]
 
-        async with self.api.create_client() as client:
-            await client.temperature_api.async_set_heading_mode(mode)
+        self._attr_hvac_mode = hvac_mode
+        await self._async_write_optimistic(self.api.async_set_heating_mode(mode))
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
         new_temp = kwargs["temperature"]
 
-        async with self.api.create_client() as client:
-            if self.hvac_mode == HVACMode.OFF:
-                await client.temperature_api.async_set_minimal_temperature(new_temp)
-            else:
-                await client.temperature_api.async_set_temperature(new_temp)
+        if self.hvac_mode == HVACMode.OFF:
+            command = self.api.async_set_minimal_temperature(new_temp)
+        else:
+            command = self.api.async_set_temperature(new_temp)
+
+        self._attr_target_temperature = new_temp
+        await self._async_write_optimistic(command)
 
     async def async_turn_on(self) -> None:
         """Turn the entity on."""
-        async with self.api.create_client() as client:
-            await client.temperature_api.async_set_heading_mode(HeatingMode.COMFORT)
+        await self.async_set_hvac_mode(HVACMode.HEAT)
 
     async def async_turn_off(self) -> None:
         """Turn the entity off."""
-        async with self.api.create_client() as client:
-            await client.temperature_api.async_set_heading_mode(HeatingMode.MINIMAL)
-
-    async def async_update(self) -> None:
-        """Update state of entity."""
-        heating_data = await self.api.async_get_heating_data()
-
-        heating_mode = heating_data.heating_mode
-        match heating_mode:
-            case HeatingMode.SCHEDULED:
-                self.hvac_mode = HVACMode.AUTO
-            case HeatingMode.COMFORT:
-                self.hvac_mode = HVACMode.HEAT
-            case HeatingMode.MINIMAL:
-                self.hvac_mode = HVACMode.OFF
-
-        self._attr_current_temperature = heating_data.actual_temperature
-        self._attr_target_temperature = heating_data.set_temperature
+        await self.async_set_hvac_mode(HVACMode.OFF)
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, DEVICE_HEATING_ID)},
-        )
+        return self._device_info(DEVICE_HEATING_ID)
 
 
-class AmitVentilationClimateEntity(CoordinatorEntity, ClimateEntity):
+class AmitVentilationClimateEntity(AmitEntity, ClimateEntity):
     """Amit Ventilation climate entity. Used to control (heated) fan."""
 
     _enable_turn_on_off_backwards_compatibility = False
@@ -153,25 +164,29 @@ class AmitVentilationClimateEntity(CoordinatorEntity, ClimateEntity):
     _attr_fan_mode = FAN_OFF
     _attr_hvac_action = None
     _attr_name = None
+    _datasets = frozenset({"overview", "ventilation"})
 
     def __init__(
-        self, api: AmitApi, ventilation_coordinator: AmitFanCoordinator, entry_id: str
+        self, api: AmitApi, coordinator: AmitHvacCoordinator, entry_id: str
     ) -> None:
         """Construct climate entity."""
-        super().__init__(ventilation_coordinator)
+        super().__init__(coordinator)
         self.api = api
         self._attr_unique_id = f"{entry_id}-ventilation"
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        ventilation_data: VentilationResult = self.coordinator.data["ventilation_data"]
-        overview_data: DataResult = self.coordinator.data["overview_data"]
-        fan_map = {v: k for k, v in FAN_MODE_MAP.items()}
+        if self._is_update_irrelevant():
+            return
+        ventilation_data: VentilationResult = self.coordinator.data.ventilation
+        overview_data: DataResult = self.coordinator.data.overview
 
         self._attr_current_temperature = ventilation_data.air_temp_current
         self._attr_target_temperature = ventilation_data.air_temp_setpoint
-        self._attr_fan_mode = fan_map[ventilation_data.ventilation_mode]
+        self._attr_fan_mode = FAN_MODE_BY_VENTILATION_MODE[
+            ventilation_data.ventilation_mode
+        ]
         self._attr_hvac_mode = (
             HVACMode.HEAT if overview_data.season == Season.WINTER else HVACMode.OFF
         )
@@ -183,31 +198,40 @@ class AmitVentilationClimateEntity(CoordinatorEntity, ClimateEntity):
         # else:
         #     self._attr_hvac_action = HVACAction.OFF
 
-        self.async_write_ha_state()
+        self._async_write_if_changed()
+
+    def _published_state(self) -> tuple:
+        """Return the values this entity publishes."""
+        return (
+            self.available,
+            self._attr_hvac_mode,
+            self._attr_fan_mode,
+            self._attr_current_temperature,
+            self._attr_target_temperature,
+        )
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
         target_season = Season.WINTER if hvac_mode == HVACMode.HEAT else Season.SUMMER
 
-        async with self.api.create_client() as client:
-            await client.temperature_api.async_set_season(target_season)
-        await self.coordinator.async_request_refresh()
+        self._attr_hvac_mode = hvac_mode
+        await self._async_write_optimistic(self.api.async_set_season(target_season))
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set new target fan mode."""
         mode = FAN_MODE_MAP[fan_mode]
 
-        async with self.api.create_client() as client:
-            await client.ventilation_api.async_set_ventilation(mode)
-        await self.coordinator.async_request_refresh()
+        self._attr_fan_mode = fan_mode
+        await self._async_write_optimistic(self.api.async_set_ventilation(mode))
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
         new_temp = kwargs["temperature"]
 
-        async with self.api.create_client() as client:
-            await client.ventilation_api.async_set_target_air_temperature(new_temp)
-        await self.coordinator.async_request_refresh()
+        self._attr_target_temperature = new_temp
+        await self._async_write_optimistic(
+            self.api.async_set_target_air_temperature(new_temp)
+        )
 
     async def async_turn_off(self) -> None:
         """Switch off."""
@@ -220,6 +244,4 @@ class AmitVentilationClimateEntity(CoordinatorEntity, ClimateEntity):
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, DEVICE_VENTILATION_ID)},
-        )
+        return self._device_info(DEVICE_VENTILATION_ID)
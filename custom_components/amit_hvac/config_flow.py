@@ -5,18 +5,46 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-
+from aiohttp import ClientError
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, FlowResult
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    FlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 
-from amit_hvac_control.client import AmitHvacControlClient
 from amit_hvac_control.models import Config
 
-from .const import DOMAIN
+from .connection import normalize_host
+from .const import (
+    CONF_BULK_READ,
+    CONF_CHANGE_DETECTION,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_PLATFORMS,
+    CONF_RATE_LIMIT,
+    CONF_SCAN_INTERVAL,
+    CONF_STATISTICS_WINDOW,
+    CONF_WATCH_INTERVAL,
+    DEFAULT_BULK_READ,
+    DEFAULT_CHANGE_DETECTION,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATISTICS_WINDOW,
+    DEFAULT_WATCH_INTERVAL,
+    DOMAIN,
+)
+from .session import InvalidAuth, PlcLogin, async_hand_over_login, async_login
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,28 +57,56 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+PLATFORM_OPTIONS = {
+    Platform.CLIMATE: "Climate (heating and ventilation)",
+    Platform.FAN: "Fan (ventilation)",
+    Platform.NUMBER: "Number (ventilation setpoints)",
+    Platform.SENSOR: "Sensor",
+}
+
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(
+            CONF_FAST_SCAN_INTERVAL, default=DEFAULT_FAST_SCAN_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+        vol.Required(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=5, max=600)
+        ),
+        vol.Required(
+            CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+        vol.Required(
+            CONF_MAX_CONCURRENT_REQUESTS, default=DEFAULT_MAX_CONCURRENT_REQUESTS
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=4)),
+        vol.Required(CONF_RATE_LIMIT, default=DEFAULT_RATE_LIMIT): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=50)
+        ),
+        vol.Required(
+            CONF_STATISTICS_WINDOW, default=DEFAULT_STATISTICS_WINDOW
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+        vol.Required(CONF_BULK_READ, default=DEFAULT_BULK_READ): bool,
+        vol.Required(CONF_CHANGE_DETECTION, default=DEFAULT_CHANGE_DETECTION): bool,
+        vol.Required(CONF_WATCH_INTERVAL, default=DEFAULT_WATCH_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=60)
+        ),
+        vol.Required(CONF_PLATFORMS, default=list(PLATFORM_OPTIONS)): cv.multi_select(
+            PLATFORM_OPTIONS
+        ),
+    }
+)
+
 
-async def validate_input(_hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
+async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> PlcLogin:
     """Validate the user input allows us to connect.
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
+    Returns the authenticated login, to be handed over to the config entry.
     """
-    host = data["host"]
-    username = data["username"]
-    password = data["password"]
-
-    config = Config(host, username, password)
-    async with AmitHvacControlClient(config) as client:
-        if not await client.async_is_valid_auth():
-            raise InvalidAuth
-
-    # Return info that you want to store in the config entry.
-    return {
-        "title": "AMiT Hub",
-        "host": host,
-        "username": username,
-        "password": password,
-    }
+    config = Config(data[CONF_HOST], data[CONF_USERNAME], data[CONF_PASSWORD])
+    try:
+        return await async_login(hass, config)
+    except (ClientError, TimeoutError) as err:
+        raise CannotConnect from err
 
 
 class AmitHvacConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -58,32 +114,100 @@ class AmitHvacConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return AmitHvacOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
         errors: dict[str, str] = {}
         if user_input is not None:
-            try:
-                info = await validate_input(self.hass, user_input)
-            except CannotConnect:
-                errors["base"] = "cannot_connect"
-            except InvalidAuth:
-                errors["base"] = "invalid_auth"
-            except Exception:  # pylint: disable=broad-except
-                _LOGGER.exception("Unexpected exception")
-                errors["base"] = "unknown"
-            else:
-                return self.async_create_entry(title=info["title"], data=user_input)
+            await self.async_set_unique_id(normalize_host(user_input[CONF_HOST]))
+            self._abort_if_unique_id_configured()
+            if (login := await self._async_validate(user_input, errors)) is not None:
+                async_hand_over_login(self.hass, login)
+                return self.async_create_entry(title="AMiT Hub", data=user_input)
 
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_reconfigure(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Change the host or credentials, applied without reloading the entry."""
+        entry = self._get_reconfigure_entry()
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            unique_id = normalize_host(user_input[CONF_HOST])
+            if unique_id != entry.unique_id:
+                await self.async_set_unique_id(unique_id)
+                self._abort_if_unique_id_configured()
+            if (login := await self._async_validate(user_input, errors)) is not None:
+                async_hand_over_login(self.hass, login)
+                self.hass.config_entries.async_update_entry(
+                    entry, unique_id=unique_id, data=user_input
+                )
+                return self.async_abort(reason="reconfigure_successful")
+
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=self.add_suggested_values_to_schema(
+                STEP_USER_DATA_SCHEMA,
+                {
+                    CONF_HOST: entry.data[CONF_HOST],
+                    CONF_USERNAME: entry.data[CONF_USERNAME],
+                },
+            ),
+            errors=errors,
+        )
+
+    async def _async_validate(
+        self, user_input: dict[str, Any], errors: dict[str, str]
+    ) -> PlcLogin | None:
+        """Log in with the user input, recording why in errors if it fails."""
+        try:
+            return await validate_input(self.hass, user_input)
+        except CannotConnect:
+            errors["base"] = "cannot_connect"
+        except InvalidAuth:
+            errors["base"] = "invalid_auth"
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception")
+            errors["base"] = "unknown"
+        return None
+
+
+class AmitHvacOptionsFlow(OptionsFlow):
+    """Handle Amit HVAC options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the polling options."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if not (
+                user_input[CONF_FAST_SCAN_INTERVAL]
+                <= user_input[CONF_SCAN_INTERVAL]
+                <= user_input[CONF_MAX_SCAN_INTERVAL]
+            ):
+                errors["base"] = "invalid_intervals"
+            else:
+                return self.async_create_entry(data=user_input)
 
-class CannotConnect(HomeAssistantError):
-    """Error to indicate we cannot connect."""
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, user_input or self.config_entry.options
+            ),
+            errors=errors,
+        )
 
 
-class InvalidAuth(HomeAssistantError):
-    """Error to indicate there is invalid auth."""
+class CannotConnect(HomeAssistantError):
+    """Error to indicate we cannot connect."""
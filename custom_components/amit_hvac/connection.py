@@ -0,0 +1,172 @@
+"""Connection manager shared by all Amit PLCs."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from yarl import URL
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import (
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_RATE_LIMIT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_RATE_LIMIT,
+    DOMAIN,
+    POLL_STAGGER,
+    POLL_STAGGER_WINDOW,
+)
+from .scheduler import RequestPriority, RequestScheduler
+
+DATA_CONNECTION_MANAGER: HassKey[AmitConnectionManager] = HassKey(
+    f"{DOMAIN}_connection_manager"
+)
+
+
+@dataclass
+class HostConnection:
+    """Request slots shared by every entry talking to one PLC host."""
+
+    scheduler: RequestScheduler
+    entry_ids: set[str] = field(default_factory=set)
+
+
+@dataclass
+class AmitConnection:
+    """An entry's share of the connection manager."""
+
+    manager: AmitConnectionManager
+    host: HostConnection
+    poll_phase: float
+
+    @asynccontextmanager
+    async def async_request_slot(
+        self, priority: RequestPriority = RequestPriority.POLL
+    ) -> AsyncIterator[None]:
+        """Hold a request slot of the host, within the global rate limit.
+
+        The rate limit is waited for first, so a throttled request does not
+        keep a host slot from the requests that could go out meanwhile.
+        """
+        await self.manager.async_throttle()
+        async with self.host.scheduler.async_slot(priority):
+            yield
+
+
+class AmitConnectionManager:
+    """Connection manager shared by all Amit config entries.
+
+    Requests to a PLC host are capped by a priority scheduler shared by every
+    entry using that host, at the lowest concurrency configured on any of them,
+    while the TCP connections themselves come from Home Assistant's pool.
+    Entries are keyed by their normalized host, so hosts are only shared by
+    entries set up before that, under another spelling of the same URL. Each
+    entry gets its own poll phase so PLCs on the same network segment are not
+    all polled in the same second, and all requests are spaced to honour the
+    lowest rate limit configured on any entry.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the manager."""
+        self.hass = hass
+        self._hosts: dict[str, HostConnection] = {}
+        self._poll_slots: dict[str, int] = {}
+        self._rate_limits: dict[str, float] = {}
+        self._capacities: dict[str, int] = {}
+        self._next_request = 0.0
+
+    @callback
+    def async_register(self, entry: ConfigEntry) -> AmitConnection:
+        """Register an entry and return its connection."""
+        host_name = normalize_host(entry.data[CONF_HOST])
+        self._capacities[entry.entry_id] = _entry_capacity(entry)
+        if (host := self._hosts.get(host_name)) is None:
+            host = self._hosts[host_name] = HostConnection(
+                RequestScheduler(self._capacities[entry.entry_id])
+            )
+        host.entry_ids.add(entry.entry_id)
+        self._update_capacity(host)
+
+        used = set(self._poll_slots.values())
+        slot = next(slot for slot in range(len(used) + 1) if slot not in used)
+        self._poll_slots[entry.entry_id] = slot
+        self._rate_limits[entry.entry_id] = entry.options.get(
+            CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT
+        )
+
+        return AmitConnection(self, host, slot * POLL_STAGGER % POLL_STAGGER_WINDOW)
+
+    @callback
+    def async_update(self, entry: ConfigEntry) -> None:
+        """Apply changed request options of a registered entry."""
+        self._rate_limits[entry.entry_id] = entry.options.get(
+            CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT
+        )
+        self._capacities[entry.entry_id] = _entry_capacity(entry)
+        for host in self._hosts.values():
+            if entry.entry_id in host.entry_ids:
+                self._update_capacity(host)
+
+    @callback
+    def async_unregister(self, entry: ConfigEntry) -> None:
+        """Release everything held for an entry."""
+        self._poll_slots.pop(entry.entry_id, None)
+        self._rate_limits.pop(entry.entry_id, None)
+        self._capacities.pop(entry.entry_id, None)
+        for host_name, host in list(self._hosts.items()):
+            if entry.entry_id not in host.entry_ids:
+                continue
+            host.entry_ids.discard(entry.entry_id)
+            if host.entry_ids:
+                self._update_capacity(host)
+            else:
+                del self._hosts[host_name]
+
+    def _update_capacity(self, host: HostConnection) -> None:
+        """Cap a host at the lowest concurrency of the entries using it."""
+        host.scheduler.set_capacity(
+            min(self._capacities[entry_id] for entry_id in host.entry_ids)
+        )
+
+    @property
+    def rate_limit(self) -> float:
+        """Return the requests per second allowed across all entries, 0 for none."""
+        return min((limit for limit in self._rate_limits.values() if limit), default=0)
+
+    async def async_throttle(self) -> None:
+        """Wait for the next request slot of the global rate limit."""
+        if not (rate_limit := self.rate_limit):
+            return
+        now = self.hass.loop.time()
+        delay = self._next_request - now
+        self._next_request = max(now, self._next_request) + 1 / rate_limit
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _entry_capacity(entry: ConfigEntry) -> int:
+    """Return the concurrent requests an entry allows."""
+    return entry.options.get(
+        CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+    )
+
+
+def normalize_host(host: str) -> str:
+    """Return the host and port a PLC URL points to, whatever its spelling."""
+    url = URL(host)
+    return f"{url.host}:{url.port}" if url.host else host
+
+
+@callback
+def async_get_connection_manager(hass: HomeAssistant) -> AmitConnectionManager:
+    """Return the connection manager, creating it on first use."""
+    if (manager := hass.data.get(DATA_CONNECTION_MANAGER)) is None:
+        manager = hass.data[DATA_CONNECTION_MANAGER] = AmitConnectionManager(hass)
+    return manager
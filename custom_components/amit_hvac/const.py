@@ -15,3 +15,82 @@ DEVICE_HEATING_NAME = "Heating"
 
 DEVICE_VENTILATION_ID = "Ventilation"
 DEVICE_VENTILATION_NAME = "Ventilation"
+
+REQUEST_TIMEOUT = 10
+# Seconds to connect to the PLC, so an unreachable host fails fast
+CONNECT_TIMEOUT = 3
+# Seconds a login validated by the config flow waits for its entry's setup
+LOGIN_HANDOFF_TIMEOUT = 60
+
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_BACKOFF = 10
+BREAKER_MAX_BACKOFF = 300
+# Seconds after a write is sent during which further writes are batched
+WRITE_COOLDOWN = 1.0
+# Seconds between refreshes of the PLC traffic sensors
+METRICS_REFRESH_INTERVAL = 30
+
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 2
+
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+DEFAULT_FAST_SCAN_INTERVAL = 5
+
+CONF_SCAN_INTERVAL = "scan_interval"
+DEFAULT_SCAN_INTERVAL = 30
+
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+DEFAULT_MAX_SCAN_INTERVAL = 300
+
+CONF_RATE_LIMIT = "rate_limit"
+DEFAULT_RATE_LIMIT = 0
+
+CONF_STATISTICS_WINDOW = "statistics_window"
+DEFAULT_STATISTICS_WINDOW = 60
+
+CONF_CHANGE_DETECTION = "change_detection"
+DEFAULT_CHANGE_DETECTION = False
+
+CONF_WATCH_INTERVAL = "watch_interval"
+# Every check reads the whole overview page, 4 reads a minute at 15 seconds.
+# Regular polling reads about as much at the scan interval, but backs off.
+DEFAULT_WATCH_INTERVAL = 15
+
+CONF_PLATFORMS = "platforms"
+
+CONF_BULK_READ = "bulk_read"
+DEFAULT_BULK_READ = True
+# Consecutive reads of a page that fail to parse before bulk reads are turned off
+BULK_READ_FAILURE_THRESHOLD = 3
+
+BOOST_DURATION = 60
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+# Ranges of the ventilation setpoints
+TARGET_AIR_TEMPERATURE_MIN = 15
+TARGET_AIR_TEMPERATURE_MAX = 25
+TARGET_CO2_MIN = 0
+TARGET_CO2_MAX = 1500
+
+# The last known PLC data is saved at most this many seconds after it changed
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 300
+
+# Parsed pages kept per config entry, so unchanged pages are not parsed again
+PARSE_CACHE_SIZE = 8
+
+# Samples of each reading kept for rolling statistics
+HISTORY_SIZE = 1440
+
+# Seconds over which derived rates and the heating duty cycle are smoothed
+ANALYTICS_TIME_CONSTANT = 300
+# Seconds between refreshes of the derived sensors, whose values move on polls
+# that read unchanged pages and so notify no entity
+ANALYTICS_REFRESH_INTERVAL = 60
+DUTY_CYCLE_TIME_CONSTANT = 3600
+
+# Seconds between the poll phases of config entries, phases repeat every
+# POLL_STAGGER_WINDOW seconds
+POLL_STAGGER = 3
+POLL_STAGGER_WINDOW = 30
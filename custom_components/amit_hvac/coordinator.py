@@ -1,51 +1,469 @@
 """Data Coordinator for Amit entities."""
 
-from datetime import timedelta
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timedelta
+from enum import Enum
 import logging
+import math
+from typing import Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import AmitApi
+from .analytics import AmitAnalytics
+from .api import (
+    REGISTER_HEATING_MODE,
+    REGISTER_MINIMAL_TEMPERATURE,
+    REGISTER_SEASON,
+    REGISTER_TARGET_AIR_TEMPERATURE,
+    REGISTER_TARGET_CO2,
+    REGISTER_TEMPERATURE,
+    REGISTER_VENTILATION_MODE,
+    AmitApi,
+)
+from .const import (
+    BOOST_DURATION,
+    CONF_CHANGE_DETECTION,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    CONF_WATCH_INTERVAL,
+    DEFAULT_CHANGE_DETECTION,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_WATCH_INTERVAL,
+    DOMAIN,
+    HISTORY_SIZE,
+    POLL_STAGGER_WINDOW,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .history import RingBuffer
+from .results import DataResult, TemperatureResult, VentilationResult
+from .scheduler import RequestPreempted, RequestPriority
 
 _LOGGER = logging.getLogger(__name__)
 
+DATASETS = ("overview", "heating", "ventilation")
+
+# How many scan intervals pass between reads of each dataset. The overview and
+# ventilation pages carry CO2 and air temperature. The heating page holds the
+# heating mode and setpoint, which rarely change, and the actual temperature of
+# the heating climate entity. That reading lags by up to four scan intervals,
+# it follows the slow heating circuit. A write re-reads the page at once.
+DATASET_INTERVAL_FACTOR = {
+    "overview": 1,
+    "heating": 4,
+    "ventilation": 1,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class AmitHvacData:
+    """Snapshot of every PLC dataset fetched in one update cycle.
+
+    Snapshots are immutable and shared by every entity. `changed` names the
+    datasets entities should republish: those whose values differ from the
+    previous snapshot, or that were re-read to verify a write. Flags are kept
+    per dataset rather than per field: each dataset is one page read as a
+    whole, and entities publishing a field that did not move are already held
+    back by their significant change check.
+    """
+
+    overview: DataResult
+    heating: TemperatureResult
+    ventilation: VentilationResult
+    changed: frozenset[str] = field(default=frozenset(DATASETS), compare=False)
+
+
+def _data_as_dict(data: AmitHvacData) -> dict[str, dict[str, Any]]:
+    """Return a snapshot as JSON serializable dicts, enums by value."""
+    return {
+        dataset: {
+            key: value.value if isinstance(value, Enum) else value
+            for key, value in asdict(getattr(data, dataset)).items()
+        }
+        for dataset in DATASETS
+    }
+
+
+def _data_from_dict(stored: dict[str, dict[str, Any]]) -> AmitHvacData:
+    """Rebuild a snapshot saved by `_data_as_dict`."""
+    return AmitHvacData(
+        overview=DataResult(**stored["overview"]),
+        heating=TemperatureResult(**stored["heating"]),
+        ventilation=VentilationResult(**stored["ventilation"]),
+    )
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the last known data of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+# In change detection mode only the overview is polled, its control values
+# tell when the other pages are worth reading.
+WATCHED_DATASET = "overview"
+
+
+def _control_values(overview: DataResult) -> tuple:
+    """Return the overview values set on the PLC or the wall controller."""
+    return (overview.ventilation_mode, overview.season, overview.heating_mode)
+
 
-class AmitSensorCoordinator(DataUpdateCoordinator):
-    """Amit sensor coordinator."""
+# Overview readings kept in memory for rolling statistics, by sensor key
+HISTORY_METRICS: dict[str, Callable[[DataResult], float | None]] = {
+    "temperature": lambda overview: overview.temperature,
+    "air_temperature": lambda overview: overview.air_temperature,
+    "co2": lambda overview: overview.co_2,
+}
+
+
+# The dataset holding each writable register, with a getter reading it back
+# for verification (None when the PLC does not expose the written value).
+REGISTERS: dict[str, tuple[str, Callable[[AmitHvacData], Any] | None]] = {
+    REGISTER_VENTILATION_MODE: (
+        "ventilation",
+        lambda data: data.ventilation.ventilation_mode,
+    ),
+    REGISTER_TARGET_AIR_TEMPERATURE: (
+        "ventilation",
+        lambda data: data.ventilation.air_temp_setpoint,
+    ),
+    REGISTER_TARGET_CO2: ("ventilation", lambda data: data.ventilation.co2_setpoint),
+    REGISTER_HEATING_MODE: ("heating", lambda data: data.heating.heating_mode),
+    REGISTER_TEMPERATURE: ("heating", lambda data: data.heating.set_temperature),
+    REGISTER_MINIMAL_TEMPERATURE: ("heating", None),
+    REGISTER_SEASON: ("overview", lambda data: data.overview.season),
+}
+
+
+class AmitHvacCoordinator(DataUpdateCoordinator[AmitHvacData]):
+    """Amit HVAC coordinator.
+
+    Polls adaptively: fast for a while after a command, at the regular interval
+    while readings change, and backing off up to the maximum interval while
+    readings are stable or the PLC is unreachable.
+
+    In change detection mode only the overview page is polled, at the watch
+    interval. The other pages are read as soon as its control values change,
+    for instance on the wall controller, and otherwise every maximum interval.
+    Setpoints are not on the overview, a change made on the wall controller
+    shows with that delay. The watch reads a whole page each time, so short
+    watch intervals cost more traffic than regular polling.
+
+    The last known data is saved to a store, so entities can be restored from
+    it at startup while the first live refresh runs in the background.
+
+    A refresh that reads only pages identical to the current ones keeps the
+    current snapshot, and listeners are only called when the data changed.
+
+    Datasets no added entity reads are not polled once the first snapshot is
+    in, they are only re-read to verify writes to their registers.
+    """
 
     def __init__(self, hass: HomeAssistant, amit_api: AmitApi) -> None:
         """Initialize my coordinator."""
         super().__init__(
             hass,
             _LOGGER,
-            name="sensor",
-            update_interval=timedelta(seconds=30),
+            name="hvac",
+            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            always_update=False,
         )
         self.amit_api = amit_api
+        self._fetched_at: dict[str, datetime] = {}
+        self._boost_until: datetime | None = None
+        self.history = {key: RingBuffer(HISTORY_SIZE) for key in HISTORY_METRICS}
+        self.analytics = AmitAnalytics()
+        self._store = snapshot_store(hass, self.config_entry.entry_id)
+        self._save_scheduled = False
+        self._consumers: Counter[str] = Counter()
 
-    async def _async_update_data(self):
-        """Get data from API."""
-        return await self.amit_api.async_get_data()
+        self._apply_options(self.config_entry.options)
+        self._set_interval(self._next_interval(changed=True))
 
+        amit_api.async_add_write_listener(self._async_handle_write)
 
-class AmitFanCoordinator(DataUpdateCoordinator):
-    """Amit fan coordinator."""
+    @callback
+    def async_update_options(self, options: Mapping[str, Any]) -> None:
+        """Apply changed polling options and reschedule the next refresh."""
+        self._apply_options(options)
+        self._set_interval(self._next_interval(changed=True))
+        if self._listeners:
+            self._schedule_refresh()
 
-    def __init__(self, hass: HomeAssistant, amit_api: AmitApi) -> None:
-        """Initialize my coordinator."""
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="ventilation",
-            update_interval=timedelta(seconds=30),
+    def _apply_options(self, options: Mapping[str, Any]) -> None:
+        """Read the polling options."""
+        self.fast_interval = timedelta(
+            seconds=options.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL)
         )
-        self.amit_api = amit_api
+        self.scan_interval = timedelta(
+            seconds=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        )
+        self.max_interval = timedelta(
+            seconds=options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+        )
+        self.change_detection = options.get(
+            CONF_CHANGE_DETECTION, DEFAULT_CHANGE_DETECTION
+        )
+        self.watch_interval = timedelta(
+            seconds=options.get(CONF_WATCH_INTERVAL, DEFAULT_WATCH_INTERVAL)
+        )
+
+    @callback
+    def async_add_consumer(self, datasets: frozenset[str] | None) -> CALLBACK_TYPE:
+        """Register an entity reading datasets, all of them when None."""
+        consumed = DATASETS if datasets is None else datasets
+        self._consumers.update(consumed)
+
+        @callback
+        def remove_consumer() -> None:
+            self._consumers.subtract(consumed)
+
+        return remove_consumer
+
+    async def async_reload_data(self) -> None:
+        """Read every dataset again soon, for instance from a new host."""
+        self._fetched_at.clear()
+        await self.async_request_refresh()
+
+    async def async_restore(self) -> bool:
+        """Load the data saved by the previous run, return whether there was any.
+
+        Every dataset stays due, the next refresh reads them all.
+        """
+        if (stored := await self._store.async_load()) is None:
+            return False
+        try:
+            self.data = _data_from_dict(stored)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.debug("Ignoring unreadable saved data: %s", err)
+            return False
+        _LOGGER.debug("Restored last known HVAC data")
+        return True
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the data soon, without postponing a save already scheduled."""
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_store(self) -> dict[str, dict[str, Any]]:
+        """Return the data to save."""
+        self._save_scheduled = False
+        return _data_as_dict(self.data)
+
+    async def async_shutdown(self) -> None:
+        """Cancel refreshes and save the pending data right away."""
+        await super().async_shutdown()
+        if self._save_scheduled:
+            await self._store.async_save(self._data_to_store())
+
+    async def _async_handle_write(self, written: dict[str, Any]) -> None:
+        """Verify a write burst by re-reading only the datasets it touched.
+
+        Entities publish the commanded state optimistically, publishing the
+        verified data rolls them back if the PLC did not apply the command.
+        """
+        now = dt_util.utcnow()
+        self._boost_until = now + timedelta(seconds=BOOST_DURATION)
+        self._set_interval(self._next_interval(changed=True))
+
+        datasets = sorted({REGISTERS[register][0] for register in written})
+        results = await self.amit_api.async_read(datasets, RequestPriority.VERIFY)
+        fetched = {
+            dataset: result
+            for dataset, result in results.items()
+            if not isinstance(result, Exception)
+        }
+        if self.data is None or not fetched:
+            _LOGGER.debug("Could not verify write to %s", ", ".join(written))
+            await self.async_request_refresh()
+            return
+
+        for dataset in fetched:
+            self._fetched_at[dataset] = now
+        if "overview" in fetched:
+            self._record_history(now, fetched["overview"])
+        data = replace(self.data, **fetched, changed=frozenset(fetched))
+        if "ventilation" in fetched:
+            self.analytics.update(now.timestamp(), data)
 
-    async def _async_update_data(self):
-        """Get data from API."""
-        _LOGGER.debug("Start loading ventilation data...")
-        ventilation_data = await self.amit_api.async_get_ventilation_data()
-        overview_data = await self.amit_api.async_get_data()
-        _LOGGER.debug("Ventilation data loaded")
-        return {"ventilation_data": ventilation_data, "overview_data": overview_data}
+        for register, value in written.items():
+            dataset, getter = REGISTERS[register]
+            if getter is None or dataset not in fetched:
+                continue
+            actual = getter(data)
+            if isinstance(value, float | int) and isinstance(actual, float | int):
+                applied = math.isclose(actual, value, abs_tol=0.05)
+            else:
+                applied = actual == value
+            if not applied:
+                _LOGGER.warning(
+                    "PLC did not apply %s: wrote %s, reads %s", register, value, actual
+                )
+
+        self.async_set_updated_data(data)
+        self._async_schedule_save()
+
+    def _record_history(self, now: datetime, overview: DataResult) -> None:
+        """Append the overview readings to their history."""
+        timestamp = now.timestamp()
+        for key, value_fn in HISTORY_METRICS.items():
+            if (value := value_fn(overview)) is not None:
+                self.history[key].append(timestamp, value)
+
+    def _due_datasets(self, now: datetime) -> list[str]:
+        """Return the datasets whose own cadence has elapsed."""
+        if self.data is None:
+            return list(DATASETS)
+
+        # Allow half an interval of slack so timer jitter does not skip a tick
+        slack = self._interval / 2
+        due = []
+        for dataset in DATASETS:
+            if self._consumers[dataset] <= 0 and not (
+                self.change_detection and dataset == WATCHED_DATASET
+            ):
+                continue
+            if self.change_detection and dataset != WATCHED_DATASET:
+                interval = self.max_interval
+            else:
+                interval = min(
+                    self._interval * DATASET_INTERVAL_FACTOR[dataset],
+                    self.max_interval,
+                )
+            fetched_at = self._fetched_at.get(dataset)
+            if fetched_at is None or now - fetched_at + slack >= interval:
+                due.append(dataset)
+        return due
+
+    def _unread_on_control_change(self, results: dict[str, Any]) -> list[str]:
+        """Return the datasets to read because the watched control values changed."""
+        if not self.change_detection or self.data is None:
+            return []
+        overview = results.get(WATCHED_DATASET)
+        if not isinstance(overview, DataResult):
+            return []
+        if _control_values(overview) == _control_values(self.data.overview):
+            return []
+        return [
+            dataset
+            for dataset in DATASETS
+            if dataset not in results and self._consumers[dataset] > 0
+        ]
+
+    def _next_interval(self, changed: bool) -> timedelta:
+        """Pick the interval until the next refresh."""
+        if self.change_detection:
+            return self.watch_interval
+        if self._boost_until is not None and dt_util.utcnow() < self._boost_until:
+            return self.fast_interval
+        if changed:
+            return self.scan_interval
+        return self._slower_interval()
+
+    def _set_interval(self, interval: timedelta) -> None:
+        """Set the interval until the next refresh, aligned to the poll phase.
+
+        Refreshes land on a grid offset by this entry's poll phase, so entries
+        polling at the same interval stay apart. The grid repeats at most every
+        POLL_STAGGER_WINDOW seconds, which bounds the shift needed to get onto it.
+        """
+        self._interval = interval
+        seconds = interval.total_seconds()
+        period = min(seconds, POLL_STAGGER_WINDOW)
+        target = self.hass.loop.time() + seconds
+        shift = (self.amit_api.connection.poll_phase - target + period / 2) % period
+        self.update_interval = timedelta(seconds=seconds + shift - period / 2)
+
+    def _slower_interval(self) -> timedelta:
+        """Return the next back-off step, capped at the maximum interval."""
+        return min(max(self._interval, self.scan_interval) * 2, self.max_interval)
+
+    async def _async_update_data(self) -> AmitHvacData:
+        """Get data from API.
+
+        The due datasets are read concurrently (bounded by the API's request cap).
+        A dataset that fails or is not due keeps its last good value, the refresh
+        only fails when there is nothing to fall back to.
+        """
+        now = dt_util.utcnow()
+        due = self._due_datasets(now)
+        if not due:
+            return self.data
+        _LOGGER.debug("Start loading HVAC data: %s", ", ".join(due))
+
+        results = await self.amit_api.async_read(due)
+        # A poll cancelled by a write is not a failure, the write is re-read
+        results = {
+            dataset: result
+            for dataset, result in results.items()
+            if not isinstance(result, RequestPreempted)
+        }
+        if not results:
+            if self.data is None:
+                raise UpdateFailed("Poll preempted by a write")
+            return self.data
+        if unread := self._unread_on_control_change(results):
+            _LOGGER.debug("Control values changed, loading %s", ", ".join(unread))
+            results |= await self.amit_api.async_read(unread)
+
+        if all(isinstance(result, Exception) for result in results.values()):
+            self._set_interval(self._slower_interval())
+            err = next(iter(results.values()))
+            raise UpdateFailed(f"Error fetching HVAC data: {err}") from err
+
+        values = {}
+        changed = set()
+        for dataset in DATASETS:
+            result = results.get(dataset)
+            if result is not None and not isinstance(result, Exception):
+                values[dataset] = result
+                self._fetched_at[dataset] = now
+                if dataset == "overview":
+                    self._record_history(now, result)
+                # Unchanged pages come back as the very same parsed result
+                previous = None if self.data is None else getattr(self.data, dataset)
+                if result is not previous and result != previous:
+                    changed.add(dataset)
+                continue
+            if self.data is None:
+                self._set_interval(self._slower_interval())
+                raise UpdateFailed(
+                    f"Error fetching {dataset} data: {result}"
+                ) from result
+            if result is not None:
+                _LOGGER.warning(
+                    "Error fetching %s data, keeping last known value: %s",
+                    dataset,
+                    result,
+                )
+            values[dataset] = getattr(self.data, dataset)
+
+        # Back to the regular interval once the PLC answers again
+        self._set_interval(
+            self._next_interval(bool(changed) or not self.last_update_success)
+        )
+        _LOGGER.debug("HVAC data loaded, next refresh in %s", self.update_interval)
+        if self.data is not None and all(
+            value is getattr(self.data, dataset) for dataset, value in values.items()
+        ):
+            data = self.data
+        else:
+            data = AmitHvacData(**values, changed=frozenset(changed))
+            if changed:
+                self._async_schedule_save()
+        if isinstance(results.get("ventilation"), VentilationResult):
+            self.analytics.update(now.timestamp(), data)
+        return data
@@ -0,0 +1,69 @@
+"""Diagnostics support for Amit HVAC."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from enum import Enum
+from typing import Any
+
+from yarl import URL
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .api_helper import AmitApiHelper
+from .const import DOMAIN
+from .coordinator import DATASETS
+
+# The unique ID is the PLC host, the title is fixed and kept
+TO_REDACT = {CONF_HOST, CONF_PASSWORD, CONF_USERNAME, "unique_id"}
+
+
+def _result_as_dict(result: Any) -> dict[str, Any]:
+    """Return the values of a PLC result, enums by name."""
+    return {
+        key: value.name if isinstance(value, Enum) else value
+        for key, value in asdict(result).items()
+    }
+
+
+def _redact_host(text: str | None, host: str) -> str | None:
+    """Return a text with the PLC URL and host name redacted."""
+    if text is None:
+        return None
+    for value in (host, URL(host).host):
+        if value:
+            text = text.replace(value, REDACTED)
+    return text
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    helper: AmitApiHelper = hass.data[DOMAIN][entry.entry_id]
+    coordinator = helper.coordinator
+
+    data = None
+    if coordinator.data is not None:
+        data = {
+            dataset: _result_as_dict(getattr(coordinator.data, dataset))
+            for dataset in DATASETS
+        }
+
+    # Connection errors name the host they could not reach
+    breaker = helper.api.breaker.as_dict()
+    breaker["last_error"] = _redact_host(breaker["last_error"], entry.data[CONF_HOST])
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "data": data,
+        },
+        "breaker": breaker,
+        "requests": helper.api.metrics.as_dict(),
+    }
@@ -0,0 +1,110 @@
+"""Base entity for Amit entities."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable
+import logging
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import AmitHvacCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def device_identifier(entry_id: str, device_id: str) -> tuple[str, str]:
+    """Return the device registry identifier of a device of a config entry."""
+    return (DOMAIN, f"{entry_id}_{device_id}")
+
+
+class AmitEntity(CoordinatorEntity[AmitHvacCoordinator]):
+    """Amit coordinator entity with optimistic command handling.
+
+    Coordinator updates only write state when a published value changed by at
+    least `_significant_change`, unchanged polls never reach the event bus.
+    `_datasets` names the coordinator datasets an entity reads, all of them when
+    None. The coordinator only polls datasets some added entity reads, and
+    entities may skip updates that changed none of theirs.
+    """
+
+    _last_published: tuple | None = None
+    _significant_change: float = 0
+    _datasets: frozenset[str] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start from the coordinator data, if any, and remember the state."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_consumer(self._datasets))
+        if self.coordinator.data is not None:
+            self._handle_coordinator_update()
+        self._last_published = self._published_state()
+
+    def _device_info(self, device_id: str) -> DeviceInfo:
+        """Return the device info of a device of this entity's config entry."""
+        return DeviceInfo(
+            identifiers={
+                device_identifier(self.coordinator.config_entry.entry_id, device_id)
+            }
+        )
+
+    def _is_update_irrelevant(self) -> bool:
+        """Return whether a coordinator update changed nothing this entity reads."""
+        return (
+            self._datasets is not None
+            and self._last_published is not None
+            and self._last_published[0] == self.available
+            and self._datasets.isdisjoint(self.coordinator.data.changed)
+        )
+
+    def _published_state(self) -> tuple | None:
+        """Return the values this entity publishes, None to always write."""
+        return None
+
+    def _is_significant(self, state: tuple) -> bool:
+        """Return whether state differs enough from the last published one."""
+        if self._last_published is None or len(state) != len(self._last_published):
+            return True
+        for old, new in zip(self._last_published, state, strict=True):
+            if old == new:
+                continue
+            if (
+                isinstance(old, float | int)
+                and isinstance(new, float | int)
+                and not isinstance(old, bool)
+                and not isinstance(new, bool)
+            ):
+                if abs(new - old) >= self._significant_change:
+                    return True
+                continue
+            return True
+        return False
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write state only when the published values changed significantly."""
+        state = self._published_state()
+        if state is None or self._is_significant(state):
+            self._last_published = state
+            self.async_write_ha_state()
+
+    async def _async_write_optimistic(self, command: Awaitable[Any]) -> None:
+        """Publish the commanded state at once, then send the command.
+
+        The caller sets the commanded `_attr_*` values first. The coordinator
+        verifies the write in the background and publishes what the PLC reports,
+        if the command itself fails the last known state is restored right away.
+        """
+        self._last_published = self._published_state()
+        self.async_write_ha_state()
+        try:
+            await command
+        except Exception:
+            _LOGGER.warning("Command for %s failed, restoring state", self.entity_id)
+            self._last_published = None
+            if self.coordinator.data is not None:
+                self._handle_coordinator_update()
+            raise
@@ -0,0 +1,87 @@
+"""Parsers of the Amit PLC pages for when bulk reads are disabled.
+
+Build a full HTML tree of each page and read the same elements as the
+page-based `amit_hvac_control` calls, with the library's own helpers for the
+modes, but a reading whose element is missing is None rather than an error.
+The library raises on a unit without the CO2 or air temperature probe.
+
+This module imports the full HTML parser, it is only loaded once needed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from bs4 import BeautifulSoup
+
+from amit_hvac_control.api.status import StatusApi
+from amit_hvac_control.api.temperature import TemperatureApi
+from amit_hvac_control.api.ventilation import VentilationApi
+
+from .results import DataResult, TemperatureResult, VentilationResult
+
+
+def _view(soup: BeautifulSoup, selector: str) -> float | None:
+    """Return the value shown by an element, None if the page has none."""
+    if (element := soup.select_one(selector)) is None:
+        return None
+    return float(element.text)
+
+
+def _edit(soup: BeautifulSoup, selector: str) -> float | None:
+    """Return the value of an input element, None if the page has none."""
+    if (element := soup.select_one(selector)) is None:
+        return None
+    return float(element.attrs["value"])
+
+
+def parse_overview(content: bytes) -> DataResult:
+    """Parse the overview page."""
+    soup = BeautifulSoup(content, "html.parser")
+    labels = StatusApi(None)._get_aws_case_labels(str(soup))  # noqa: SLF001
+    co_2 = _view(soup, ".AWNumericView2,.AWNumericView2-alert-max")
+    return DataResult(
+        temperature=_view(soup, ".AWNumericView1"),
+        air_temperature=_view(soup, ".AWNumericView3"),
+        co_2=None if co_2 is None else int(co_2),
+        ventilation_mode=labels["ventilation"],
+        season=labels["season"],
+        heating_mode=labels["heating"],
+    )
+
+
+def parse_heating(content: bytes) -> TemperatureResult:
+    """Parse the heating page."""
+    soup = BeautifulSoup(content, "html.parser")
+    return TemperatureResult(
+        _view(soup, ".AWNumericView1"),
+        _view(soup, ".AWNumericView2"),
+        TemperatureApi(None)._get_heating_mode(str(soup)),  # noqa: SLF001
+    )
+
+
+def parse_ventilation(content: bytes) -> VentilationResult:
+    """Parse the ventilation page."""
+    soup = BeautifulSoup(content, "html.parser")
+    html = str(soup)
+    api = VentilationApi(None)
+    heating_level = api._get_heating_level(html)  # noqa: SLF001
+    return VentilationResult(
+        api._get_ventilation_mode(html),  # noqa: SLF001
+        api._get_bit_fields(html).ventilation_speed,  # noqa: SLF001
+        _view(soup, ".AWNumericView1,.AWNumericView1-alert-max"),
+        _edit(soup, "input.AWNumericEditButton2"),
+        _view(soup, ".AWNumericView2"),
+        _edit(soup, "input.AWNumericEditButton1"),
+        heating_level,
+        heating_level > 0,
+    )
+
+
+# The parser of each coordinator dataset
+PARSERS: dict[str, Callable[[bytes], Any]] = {
+    "overview": parse_overview,
+    "heating": parse_heating,
+    "ventilation": parse_ventilation,
+}
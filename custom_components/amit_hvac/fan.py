@@ -9,19 +9,19 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.percentage import (
     ordered_list_item_to_percentage,
     percentage_to_ordered_list_item,
 )
 
-from amit_hvac_control.api.ventilation import VentilationResult
 from amit_hvac_control.models import VentilationMode
 
 from .api import AmitApi
 from .api_helper import AmitApiHelper
 from .const import DEVICE_VENTILATION_ID, DOMAIN
-from .coordinator import AmitFanCoordinator
+from .coordinator import AmitHvacCoordinator
+from .entity import AmitEntity
+from .results import VentilationResult
 
 ORDERED_NAMED_FAN_SPEEDS = [
     VentilationMode.LOW,
@@ -38,18 +38,12 @@ async def async_setup_entry(
     """Set up devices."""
     helper: AmitApiHelper = hass.data[DOMAIN][entry.entry_id]
 
-    await helper.ventilation_coordinator.async_config_entry_first_refresh()
-
     async_add_entities(
-        [
-            AmitVentilationFanEntity(
-                helper.api, helper.ventilation_coordinator, entry.entry_id
-            )
-        ]
+        [AmitVentilationFanEntity(helper.api, helper.coordinator, entry.entry_id)]
     )
 
 
-class AmitVentilationFanEntity(CoordinatorEntity, FanEntity):
+class AmitVentilationFanEntity(AmitEntity, FanEntity):
     """Fan entity."""
 
     ventilation_speed = VentilationMode.OFF  # Off, low, medium, high
@@ -66,6 +60,7 @@ class AmitVentilationFanEntity(CoordinatorEntity, FanEntity):
     _attr_is_on = False
     _attr_preset_mode = None
     _attr_assumed_state = True
+    _datasets = frozenset({"ventilation"})
 
     # @cached_property
     @property
@@ -74,10 +69,10 @@ class AmitVentilationFanEntity(CoordinatorEntity, FanEntity):
         return self._attr_is_on
 
     def __init__(
-        self, api: AmitApi, ventilation_coordinator: AmitFanCoordinator, entry_id: str
+        self, api: AmitApi, coordinator: AmitHvacCoordinator, entry_id: str
     ) -> None:
         """Construct climate entity."""
-        super().__init__(ventilation_coordinator)
+        super().__init__(coordinator)
         self.api = api
         self._attr_unique_id = f"{entry_id}-fan"
         self._attr_available = False
@@ -85,9 +80,11 @@ class AmitVentilationFanEntity(CoordinatorEntity, FanEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        if self._is_update_irrelevant():
+            return
         self._attr_assumed_state = False
         self._attr_available = True
-        ventilation_data: VentilationResult = self.coordinator.data["ventilation_data"]
+        ventilation_data: VentilationResult = self.coordinator.data.ventilation
 
         self.ventilation_speed = ventilation_data.ventilation_speed
         self._attr_is_on = ventilation_data.ventilation_mode != VentilationMode.OFF
@@ -96,7 +93,17 @@ class AmitVentilationFanEntity(CoordinatorEntity, FanEntity):
             if ventilation_data.ventilation_mode == VentilationMode.AUTO
             else None
         )
-        self.async_write_ha_state()
+        self._async_write_if_changed()
+
+    def _published_state(self) -> tuple:
+        """Return the values this entity publishes."""
+        return (
+            self.available,
+            self.ventilation_speed,
+            self._attr_is_on,
+            self._attr_preset_mode,
+            self._attr_assumed_state,
+        )
 
     @property
     def percentage(self) -> int | None:
@@ -123,33 +130,30 @@ class AmitVentilationFanEntity(CoordinatorEntity, FanEntity):
     async def async_set_mode(self, mode: VentilationMode):
         """Set ventilation mode."""
 
-        # Heuristic update
+        # Optimistic update
         self.ventilation_speed = mode
         self._attr_is_on = mode != VentilationMode.OFF
+        self._attr_preset_mode = None
         self._attr_assumed_state = True
 
         # Update
-        async with self.api.create_client() as client:
-            await client.ventilation_api.async_set_ventilation(mode)
-
-        # Refresh
-        await self.coordinator.async_request_refresh()
+        await self._async_write_optimistic(self.api.async_set_ventilation(mode))
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
 
-        # Heuristic update
+        if preset_mode != PRESET_AUTO:
+            return
+
+        # Optimistic update
         self._attr_is_on = True
         self._attr_assumed_state = True
-        self._attr_preset_mode = PRESET_AUTO if preset_mode == PRESET_AUTO else None
+        self._attr_preset_mode = PRESET_AUTO
 
         # Update
-        if preset_mode == PRESET_AUTO:
-            async with self.api.create_client() as client:
-                await client.ventilation_api.async_set_ventilation(VentilationMode.AUTO)
-
-        # Refresh
-        await self.coordinator.async_request_refresh()
+        await self._async_write_optimistic(
+            self.api.async_set_ventilation(VentilationMode.AUTO)
+        )
 
     async def async_turn_on(
         self,
@@ -169,22 +173,18 @@ class AmitVentilationFanEntity(CoordinatorEntity, FanEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
 
-        # Heurstic update
+        # Optimistic update
         self.ventilation_speed = VentilationMode.OFF
         self._attr_is_on = False
         self._attr_preset_mode = None
         self._attr_assumed_state = True
 
         # Switch off
-        async with self.api.create_client() as client:
-            await client.ventilation_api.async_set_ventilation(VentilationMode.OFF)
-
-        # Refresh
-        await self.coordinator.async_request_refresh()
+        await self._async_write_optimistic(
+            self.api.async_set_ventilation(VentilationMode.OFF)
+        )
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, DEVICE_VENTILATION_ID)},
-        )
+        return self._device_info(DEVICE_VENTILATION_ID)
@@ -0,0 +1,74 @@
+"""In-memory history of PLC readings."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+
+class RingBuffer:
+    """Fixed-size history of timestamped samples.
+
+    Timestamps and values live in two preallocated float arrays, appending
+    overwrites the oldest sample once the buffer is full.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize the buffer."""
+        self.size = size
+        self._timestamps = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._count
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, dropping the oldest one when full."""
+        self._timestamps[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+
+    def window(self, since: float) -> tuple[list[float], list[float]]:
+        """Return the timestamps and values of the samples taken since a time."""
+        timestamps: list[float] = []
+        values: list[float] = []
+        index = self._next
+        for _ in range(self._count):
+            index = (index - 1) % self.size
+            if self._timestamps[index] < since:
+                break
+            timestamps.append(self._timestamps[index])
+            values.append(self._values[index])
+        timestamps.reverse()
+        values.reverse()
+        return timestamps, values
+
+    def statistics(self, now: float, window: float) -> dict[str, Any]:
+        """Return min, max, mean and slope per hour over the last window seconds."""
+        timestamps, values = self.window(now - window)
+        if not values:
+            return {"count": 0, "min": None, "max": None, "mean": None, "slope": None}
+
+        count = len(values)
+        mean = sum(values) / count
+        slope = None
+        if count > 1:
+            mean_time = sum(timestamps) / count
+            variance = sum((t - mean_time) ** 2 for t in timestamps)
+            if variance:
+                covariance = sum(
+                    (t - mean_time) * (v - mean)
+                    for t, v in zip(timestamps, values, strict=True)
+                )
+                slope = covariance / variance * 3600
+        return {
+            "count": count,
+            "min": min(values),
+            "max": max(values),
+            "mean": mean,
+            "slope": slope,
+        }
@@ -0,0 +1,197 @@
+"""Request metrics for the Amit PLC."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import (
+    ClientSession,
+    TraceConfig,
+    TraceRequestChunkSentParams,
+    TraceRequestEndParams,
+    TraceRequestExceptionParams,
+    TraceRequestStartParams,
+    TraceResponseChunkReceivedParams,
+)
+
+# Upper bounds of the latency histogram buckets in seconds, the last bucket
+# counts everything slower.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class EndpointMetrics:
+    """Traffic of a single PLC endpoint."""
+
+    requests: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    latency_total: float = 0
+    latency_max: float = 0
+    latency_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+    @property
+    def latency_mean(self) -> float | None:
+        """Return the mean latency of the completed requests in seconds."""
+        completed = self.requests - self.errors
+        return self.latency_total / completed if completed else None
+
+    def record_latency(self, latency: float) -> None:
+        """Record the latency of a completed request."""
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        histogram = {
+            f"<={bound}s": count
+            for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets, strict=False)
+        }
+        histogram[f">{LATENCY_BUCKETS[-1]}s"] = self.latency_buckets[-1]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency_mean": self.latency_mean,
+            "latency_max": self.latency_max,
+            "latency_histogram": histogram,
+        }
+
+
+@dataclass
+class PlcMetrics:
+    """Traffic between Home Assistant and the PLC, per endpoint and in total."""
+
+    endpoints: dict[str, EndpointMetrics] = field(default_factory=dict)
+    logins: int = 0
+    relogins: int = 0
+    # Reads and writes that failed, timeouts include those hit while reading
+    # the response body, which the per-endpoint trace does not see.
+    failed_operations: int = 0
+    timeouts: int = 0
+    # Polls cancelled to make room for a write
+    preempted: int = 0
+    # Bulk read pages that were byte for byte the same as one parsed before
+    parse_cache_hits: int = 0
+    parse_cache_misses: int = 0
+    latency_last: float | None = None
+
+    @property
+    def requests(self) -> int:
+        """Return the number of HTTP requests sent."""
+        return sum(endpoint.requests for endpoint in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Return the number of HTTP requests that failed."""
+        return sum(endpoint.errors for endpoint in self.endpoints.values())
+
+    @property
+    def bytes_received(self) -> int:
+        """Return the number of response bytes received."""
+        return sum(endpoint.bytes_received for endpoint in self.endpoints.values())
+
+    @property
+    def latency_mean(self) -> float | None:
+        """Return the mean latency over all endpoints in seconds."""
+        completed = self.requests - self.errors
+        if not completed:
+            return None
+        total = sum(endpoint.latency_total for endpoint in self.endpoints.values())
+        return total / completed
+
+    @property
+    def parse_cache_hit_rate(self) -> float | None:
+        """Return the share of bulk read pages that did not need parsing."""
+        parsed = self.parse_cache_hits + self.parse_cache_misses
+        return self.parse_cache_hits / parsed if parsed else None
+
+    def endpoint(self, method: str, path: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint, creating them on first use."""
+        key = f"{method} {path}"
+        if (metrics := self.endpoints.get(key)) is None:
+            metrics = self.endpoints[key] = EndpointMetrics()
+        return metrics
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "logins": self.logins,
+            "relogins": self.relogins,
+            "failed_operations": self.failed_operations,
+            "preempted": self.preempted,
+            "parse_cache_hits": self.parse_cache_hits,
+            "parse_cache_misses": self.parse_cache_misses,
+            "parse_cache_hit_rate": self.parse_cache_hit_rate,
+            "bytes_received": self.bytes_received,
+            "latency_mean": self.latency_mean,
+            "latency_last": self.latency_last,
+            "endpoints": {
+                key: endpoint.as_dict() for key, endpoint in self.endpoints.items()
+            },
+        }
+
+    def trace_config(self) -> TraceConfig:
+        """Return an aiohttp trace config recording into these metrics."""
+        trace_config = TraceConfig()
+
+        async def on_request_start(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceRequestStartParams,
+        ) -> None:
+            context.endpoint = self.endpoint(params.method, params.url.path)
+            context.endpoint.requests += 1
+            context.started = time.monotonic()
+
+        async def on_request_chunk_sent(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceRequestChunkSentParams,
+        ) -> None:
+            context.endpoint.bytes_sent += len(params.chunk)
+
+        async def on_response_chunk_received(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceResponseChunkReceivedParams,
+        ) -> None:
+            context.endpoint.bytes_received += len(params.chunk)
+
+        async def on_request_end(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceRequestEndParams,
+        ) -> None:
+            self.latency_last = time.monotonic() - context.started
+            context.endpoint.record_latency(self.latency_last)
+
+        async def on_request_exception(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceRequestExceptionParams,
+        ) -> None:
+            context.endpoint.errors += 1
+            if isinstance(params.exception, TimeoutError):
+                context.endpoint.timeouts += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_chunk_sent.append(on_request_chunk_sent)
+        trace_config.on_response_chunk_received.append(on_response_chunk_received)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        return trace_config
@@ -1,8 +1,10 @@
 """Platform for sensor integration."""
+
 from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from operator import attrgetter
 
 from homeassistant.components.number import (
     NumberDeviceClass,
@@ -15,14 +17,20 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from amit_hvac_control.api.ventilation import VentilationResult
 
 from .api import AmitApi
 from .api_helper import AmitApiHelper
-from .const import DEVICE_VENTILATION_ID, DOMAIN
-from .coordinator import AmitSensorCoordinator
+from .const import (
+    DEVICE_VENTILATION_ID,
+    DOMAIN,
+    TARGET_AIR_TEMPERATURE_MAX,
+    TARGET_AIR_TEMPERATURE_MIN,
+    TARGET_CO2_MAX,
+    TARGET_CO2_MIN,
+)
+from .coordinator import AmitHvacCoordinator
+from .entity import AmitEntity
+from .results import VentilationResult
 
 
 @dataclass(kw_only=True)
@@ -44,10 +52,10 @@ NUMBERS = {
         device_class=NumberDeviceClass.TEMPERATURE,
         device_identifier=DEVICE_VENTILATION_ID,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        native_min_value=15,
-        native_max_value=25,
-        value_fn=lambda result: result.air_temp_setpoint,
-        exists_fn=lambda result: bool(result.air_temp_setpoint),
+        native_min_value=TARGET_AIR_TEMPERATURE_MIN,
+        native_max_value=TARGET_AIR_TEMPERATURE_MAX,
+        value_fn=attrgetter("air_temp_setpoint"),
+        exists_fn=lambda result: result.air_temp_setpoint is not None,
     ),
     KEY_TARGET_CO2: AmitNumberEntityDescription(
         key=KEY_TARGET_CO2,
@@ -55,11 +63,11 @@ NUMBERS = {
         device_identifier=DEVICE_VENTILATION_ID,
         device_class=NumberDeviceClass.CO2,
         native_unit_of_measurement=CONCENTRATION_PARTS_PER_MILLION,
-        native_min_value=0,
-        native_max_value=1500,
+        native_min_value=TARGET_CO2_MIN,
+        native_max_value=TARGET_CO2_MAX,
         native_step=100,
-        value_fn=lambda result: result.co2_setpoint,
-        exists_fn=lambda result: bool(result.co2_setpoint),
+        value_fn=attrgetter("co2_setpoint"),
+        exists_fn=lambda result: result.co2_setpoint is not None,
     ),
 }
 
@@ -70,25 +78,27 @@ async def async_setup_entry(
     """Set up devices."""
 
     helper: AmitApiHelper = hass.data[DOMAIN][entry.entry_id]
-    coordinator = helper.ventilation_coordinator
-
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = helper.coordinator
 
+    # Only create setpoints the PLC reports a value for
+    ventilation = coordinator.data.ventilation
     async_add_entities(
         AmitNumberEntity(helper.api, coordinator, description, entry.entry_id)
         for description in NUMBERS.values()
+        if description.exists_fn(ventilation)
     )
 
 
-class AmitNumberEntity(CoordinatorEntity, NumberEntity):
+class AmitNumberEntity(AmitEntity, NumberEntity):
     """Representation of a Number."""
 
     _attr_has_entity_name = True
+    _datasets = frozenset({"ventilation"})
 
     def __init__(
         self,
         api: AmitApi,
-        coordinator: AmitSensorCoordinator,
+        coordinator: AmitHvacCoordinator,
         entity_description: AmitNumberEntityDescription,
         entry_id: str,
     ) -> None:
@@ -102,34 +112,36 @@ class AmitNumberEntity(CoordinatorEntity, NumberEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        if self._is_update_irrelevant():
+            return
         self._attr_native_value = self.entity_description.value_fn(
-            self.coordinator.data["ventilation_data"]
+            self.coordinator.data.ventilation
         )
         self._attr_available = True
-        self.async_write_ha_state()
+        self._async_write_if_changed()
+
+    def _published_state(self) -> tuple:
+        """Return the values this entity publishes."""
+        return (self.available, self._attr_native_value)
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
         key = self.entity_description.key
+        self._attr_native_value = value
         if key == KEY_TARGET_AIR_TEMPERATURE:
-            await self._async_set_air_temp_setpoint(value)
+            await self._async_write_optimistic(self._async_set_air_temp_setpoint(value))
         elif key == KEY_TARGET_CO2:
-            await self._async_set_co2_setpoint(value)
-        await self.coordinator.async_request_refresh()
+            await self._async_write_optimistic(self._async_set_co2_setpoint(value))
 
     async def _async_set_air_temp_setpoint(self, value: float):
         """Set air temperature setpoint."""
-        async with self._api.create_client() as client:
-            await client.ventilation_api.async_set_target_air_temperature(value)
+        await self._api.async_set_target_air_temperature(value)
 
     async def _async_set_co2_setpoint(self, value: float):
         """Set Co2 setpoint."""
-        async with self._api.create_client() as client:
-            await client.ventilation_api.async_set_target_co2(value)
+        await self._api.async_set_target_co2(value)
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.entity_description.device_identifier)}
-        )
+        return self._device_info(self.entity_description.device_identifier)
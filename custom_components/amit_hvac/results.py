@@ -0,0 +1,72 @@
+"""PLC data held by the integration.
+
+Attribute compatible with the results of `amit_hvac_control`, whose modules
+import a full HTML parser. Keeping to these lets the integration load without
+it, the library is only imported once its page-based calls are needed.
+
+Results are immutable and slotted, they are shared between the parse cache,
+the coordinator snapshots and every entity. A reading is None when the unit has
+no probe for it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from amit_hvac_control.models import HeatingMode, Season, VentilationMode
+
+
+@dataclass(frozen=True, slots=True)
+class DataResult:
+    """Readings of the overview page."""
+
+    temperature: float | None
+    air_temperature: float | None
+    co_2: int | None
+    ventilation_mode: VentilationMode
+    season: Season
+    heating_mode: HeatingMode
+
+    def __post_init__(self) -> None:
+        """Accept enums by value."""
+        object.__setattr__(
+            self, "ventilation_mode", VentilationMode(self.ventilation_mode)
+        )
+        object.__setattr__(self, "season", Season(self.season))
+        object.__setattr__(self, "heating_mode", HeatingMode(self.heating_mode))
+
+
+@dataclass(frozen=True, slots=True)
+class TemperatureResult:
+    """Readings of the heating page."""
+
+    actual_temperature: float | None
+    set_temperature: float | None
+    heating_mode: HeatingMode
+
+    def __post_init__(self) -> None:
+        """Accept enums by value."""
+        object.__setattr__(self, "heating_mode", HeatingMode(self.heating_mode))
+
+
+@dataclass(frozen=True, slots=True)
+class VentilationResult:
+    """Readings of the ventilation page."""
+
+    ventilation_mode: VentilationMode
+    ventilation_speed: VentilationMode
+    co2_current: float | None
+    co2_setpoint: float | None
+    air_temp_current: float | None
+    air_temp_setpoint: float | None
+    heating_level: float
+    heating_on: bool
+
+    def __post_init__(self) -> None:
+        """Accept enums by value."""
+        object.__setattr__(
+            self, "ventilation_mode", VentilationMode(self.ventilation_mode)
+        )
+        object.__setattr__(
+            self, "ventilation_speed", VentilationMode(self.ventilation_speed)
+        )
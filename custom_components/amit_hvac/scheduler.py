@@ -0,0 +1,116 @@
+"""Priority scheduling of the requests to a PLC host."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import IntEnum
+import heapq
+import itertools
+import logging
+
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Priority class of a request, lower values are served first."""
+
+    WRITE = 0
+    VERIFY = 1
+    POLL = 2
+
+
+class RequestPreempted(HomeAssistantError):
+    """Error to indicate a poll was cancelled to make room for a write."""
+
+
+class RequestScheduler:
+    """Hand out the request slots of a PLC host by priority.
+
+    At most `capacity` requests are in flight. A freed slot goes to the waiting
+    request of the highest priority, first come first served within a class.
+    A write that finds every slot taken while a poll is in flight cancels the
+    oldest poll: its result would be stale once the write lands, and the write
+    is verified by a fresh read anyway. The poll fails with RequestPreempted.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the scheduler."""
+        self.capacity = capacity
+        self._active = 0
+        self._waiters: list[tuple[RequestPriority, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._running: dict[asyncio.Task, RequestPriority] = {}
+        self._preempted: set[asyncio.Task] = set()
+
+    @asynccontextmanager
+    async def async_slot(self, priority: RequestPriority) -> AsyncIterator[None]:
+        """Hold a request slot, waiting for it by priority."""
+        await self._async_acquire(priority)
+        task = asyncio.current_task()
+        self._running[task] = priority
+        try:
+            yield
+        except asyncio.CancelledError:
+            if task not in self._preempted:
+                raise
+            self._preempted.discard(task)
+            task.uncancel()
+            raise RequestPreempted("Poll cancelled to make room for a write") from None
+        finally:
+            self._preempted.discard(task)
+            del self._running[task]
+            self._release()
+
+    async def _async_acquire(self, priority: RequestPriority) -> None:
+        """Take a free slot, or wait until one is handed over."""
+        if self._active < self.capacity and not self._waiters:
+            self._active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, waiter)
+        if priority is RequestPriority.WRITE:
+            self._preempt_poll()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+
+    def set_capacity(self, capacity: int) -> None:
+        """Change the number of slots, new ones go to waiting requests at once."""
+        self.capacity = capacity
+        while self._waiters and self._active < self.capacity:
+            self._active += 1
+            self._release()
+
+    def _release(self) -> None:
+        """Hand a slot over to the first waiter, or free it."""
+        # Slots above a lowered capacity are freed rather than handed over
+        while self._waiters and self._active <= self.capacity:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    def _preempt_poll(self) -> None:
+        """Cancel the oldest poll in flight, unless one is already being cancelled."""
+        if self._active < self.capacity or self._preempted:
+            return
+        for task, priority in self._running.items():
+            if priority is RequestPriority.POLL:
+                _LOGGER.debug("Cancelling a poll to make room for a write")
+                self._preempted.add(task)
+                task.cancel()
+                return
@@ -1,8 +1,14 @@
 """Platform for sensor integration."""
+
 from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Any
+
+import voluptuous as vol
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -11,19 +17,51 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONCENTRATION_PARTS_PER_MILLION, UnitOfTemperature
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import (
+    CONCENTRATION_PARTS_PER_MILLION,
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from amit_hvac_control.api.status import DataResult
+from amit_hvac_control.models import VentilationMode
 
+from .analytics import AmitAnalytics
 from .api import AmitApi
 from .api_helper import AmitApiHelper
-from .const import DEVICE_HEATING_ID, DEVICE_VENTILATION_ID, DOMAIN
-from .coordinator import AmitSensorCoordinator
+from .const import (
+    ANALYTICS_REFRESH_INTERVAL,
+    CONF_STATISTICS_WINDOW,
+    DEFAULT_STATISTICS_WINDOW,
+    DEVICE_HEATING_ID,
+    DEVICE_VENTILATION_ID,
+    DOMAIN,
+    METRICS_REFRESH_INTERVAL,
+    PLC_ID,
+)
+from .coordinator import AmitHvacCoordinator, AmitHvacData
+from .entity import AmitEntity
+from .metrics import PlcMetrics
+from .results import DataResult
+
+ATTR_WINDOW = "window"
+
+SERVICE_GET_STATISTICS = "get_statistics"
 
 
 @dataclass(kw_only=True)
@@ -32,6 +70,7 @@ class AmitSensorEntityDescription(SensorEntityDescription):
 
     device_identifier: str
     exists_fn: Callable[[DataResult], bool] = lambda _: True
+    significant_change: float = 0
     value_fn: Callable[[DataResult], StateType]
 
 
@@ -42,8 +81,8 @@ SENSORS = {
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda result: result.temperature,
-        exists_fn=lambda result: bool(result.temperature),
+        value_fn=attrgetter("temperature"),
+        exists_fn=lambda result: result.temperature is not None,
     ),
     "air_temperature": AmitSensorEntityDescription(
         key="air_temperature",
@@ -51,8 +90,8 @@ SENSORS = {
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda result: result.air_temperature,
-        exists_fn=lambda result: bool(result.air_temperature),
+        value_fn=attrgetter("air_temperature"),
+        exists_fn=lambda result: result.air_temperature is not None,
     ),
     "co2": AmitSensorEntityDescription(
         key="co2",
@@ -60,8 +99,145 @@ SENSORS = {
         device_class=SensorDeviceClass.CO2,
         native_unit_of_measurement=CONCENTRATION_PARTS_PER_MILLION,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda result: result.co_2,
-        exists_fn=lambda result: bool(result.co_2),
+        significant_change=5,
+        value_fn=attrgetter("co_2"),
+        exists_fn=lambda result: result.co_2 is not None,
+    ),
+}
+
+
+@dataclass(kw_only=True)
+class AmitAnalyticsSensorEntityDescription(SensorEntityDescription):
+    """Describes Amit sensor entity derived from coordinator data."""
+
+    device_identifier: str
+    significant_change: float = 0
+    value_fn: Callable[[AmitAnalytics, AmitHvacData], StateType]
+
+
+def _fan_run_time(mode: VentilationMode) -> AmitAnalyticsSensorEntityDescription:
+    """Describe the run time sensor of a ventilation mode."""
+    return AmitAnalyticsSensorEntityDescription(
+        key=f"fan_run_time_{mode.name.lower()}",
+        translation_key=f"fan_run_time_{mode.name.lower()}",
+        device_identifier=DEVICE_VENTILATION_ID,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=1,
+        significant_change=0.01,
+        value_fn=lambda analytics, _: analytics.fan_run_time.seconds[mode] / 3600,
+    )
+
+
+ANALYTICS_SENSORS = {
+    "co2_rate": AmitAnalyticsSensorEntityDescription(
+        key="co2_rate",
+        translation_key="co2_rate",
+        device_identifier=DEVICE_VENTILATION_ID,
+        native_unit_of_measurement="ppm/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        significant_change=0.1,
+        value_fn=lambda analytics, _: (
+            None if analytics.co2_rate.rate is None else analytics.co2_rate.rate * 60
+        ),
+    ),
+    "time_to_setpoint": AmitAnalyticsSensorEntityDescription(
+        key="time_to_setpoint",
+        translation_key="time_to_setpoint",
+        device_identifier=DEVICE_VENTILATION_ID,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=0,
+        significant_change=1,
+        value_fn=lambda analytics, data: (
+            None
+            if (seconds := analytics.time_to_setpoint(data)) is None
+            else seconds / 60
+        ),
+    ),
+    "heating_duty_cycle": AmitAnalyticsSensorEntityDescription(
+        key="heating_duty_cycle",
+        translation_key="heating_duty_cycle",
+        device_identifier=DEVICE_VENTILATION_ID,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        significant_change=1,
+        value_fn=lambda analytics, _: (
+            None
+            if analytics.heating_duty_cycle.duty is None
+            else analytics.heating_duty_cycle.duty * 100
+        ),
+    ),
+    **{
+        description.key: description
+        for description in map(
+            _fan_run_time,
+            (
+                VentilationMode.LOW,
+                VentilationMode.MEDIUM,
+                VentilationMode.HIGH,
+                VentilationMode.AUTO,
+            ),
+        )
+    },
+}
+
+
+@dataclass(kw_only=True)
+class AmitPlcSensorEntityDescription(SensorEntityDescription):
+    """Describes Amit PLC traffic sensor entity."""
+
+    entity_category: EntityCategory = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+    value_fn: Callable[[PlcMetrics], StateType]
+
+
+PLC_SENSORS = {
+    "request_latency": AmitPlcSensorEntityDescription(
+        key="request_latency",
+        translation_key="request_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda metrics: (
+            None if metrics.latency_last is None else metrics.latency_last * 1000
+        ),
+    ),
+    "requests": AmitPlcSensorEntityDescription(
+        key="requests",
+        translation_key="requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.requests,
+    ),
+    "request_errors": AmitPlcSensorEntityDescription(
+        key="request_errors",
+        translation_key="request_errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.errors,
+    ),
+    "request_timeouts": AmitPlcSensorEntityDescription(
+        key="request_timeouts",
+        translation_key="request_timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.timeouts,
+    ),
+    "logins": AmitPlcSensorEntityDescription(
+        key="logins",
+        translation_key="logins",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.logins,
+    ),
+    "bytes_received": AmitPlcSensorEntityDescription(
+        key="bytes_received",
+        translation_key="bytes_received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.bytes_received,
     ),
 }
 
@@ -72,25 +248,54 @@ async def async_setup_entry(
     """Set up devices."""
 
     helper: AmitApiHelper = hass.data[DOMAIN][entry.entry_id]
-    coordinator = AmitSensorCoordinator(hass, helper.api)
-
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = helper.coordinator
 
+    # Only create sensors for probes the PLC reports a reading for
+    overview = coordinator.data.overview
     async_add_entities(
         AmitSensorEntity(helper.api, coordinator, description, entry.entry_id)
         for description in SENSORS.values()
+        if description.exists_fn(overview)
+    )
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_GET_STATISTICS,
+        {
+            vol.Optional(ATTR_WINDOW): vol.All(
+                cv.positive_int, vol.Range(min=1, max=1440)
+            )
+        },
+        "async_get_statistics",
+        supports_response=SupportsResponse.ONLY,
     )
 
+    async_add_entities(
+        AmitAnalyticsSensorEntity(coordinator, description, entry.entry_id)
+        for description in ANALYTICS_SENSORS.values()
+    )
+    async_add_entities(
+        AmitPlcSensorEntity(helper.api, coordinator, description, entry.entry_id)
+        for description in PLC_SENSORS.values()
+    )
 
-class AmitSensorEntity(CoordinatorEntity, SensorEntity):
-    """Representation of a Sensor."""
+
+class AmitSensorEntity(AmitEntity, SensorEntity):
+    """Representation of a Sensor.
+
+    Readings with a history carry their rolling min, max, mean and slope per
+    hour over the configured window as attributes, kept out of the recorder.
+    They are computed when the state is written, a change of the statistics
+    alone is not significant.
+    """
 
     _attr_has_entity_name = True
+    _unrecorded_attributes = frozenset({"min", "max", "mean", "slope", "samples"})
+    _datasets = frozenset({"overview"})
 
     def __init__(
         self,
         api: AmitApi,
-        coordinator: AmitSensorCoordinator,
+        coordinator: AmitHvacCoordinator,
         entity_description: AmitSensorEntityDescription,
         entry_id: str,
     ) -> None:
@@ -98,23 +303,184 @@ class AmitSensorEntity(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self._api = api
         self.entity_description = entity_description
+        self._significant_change = entity_description.significant_change
         self._attr_available = False  # This overrides the default
         self._attr_unique_id = f"{entry_id}-{entity_description.key}"
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-
+        if self._is_update_irrelevant():
+            return
         self._attr_available = True
         self._attr_native_value = self.entity_description.value_fn(
-            self.coordinator.data
+            self.coordinator.data.overview
         )
+        self._async_write_if_changed()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the rolling statistics of this reading."""
+        if self.entity_description.key not in self.coordinator.history:
+            return None
+        statistics = self._statistics(self._statistics_window)
+        return {
+            "min": _round(statistics["min"], 1),
+            "max": _round(statistics["max"], 1),
+            "mean": _round(statistics["mean"], 1),
+            "slope": _round(statistics["slope"], 2),
+            "samples": statistics["count"],
+        }
+
+    @property
+    def _statistics_window(self) -> int:
+        """Return the configured statistics window in minutes."""
+        return self.coordinator.config_entry.options.get(
+            CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW
+        )
+
+    def _statistics(self, window: int) -> dict[str, Any]:
+        """Return the statistics of this reading over a window in minutes."""
+        history = self.coordinator.history[self.entity_description.key]
+        return history.statistics(dt_util.utcnow().timestamp(), window * 60)
+
+    async def async_get_statistics(self, window: int | None = None) -> ServiceResponse:
+        """Return rolling statistics of this reading."""
+        if self.entity_description.key not in self.coordinator.history:
+            raise ServiceValidationError(f"{self.entity_id} keeps no history")
+        window = window or self._statistics_window
+        return {ATTR_WINDOW: window, **self._statistics(window)}
 
-        self.async_write_ha_state()
+    def _published_state(self) -> tuple:
+        """Return the values this entity publishes."""
+        return (self.available, self._attr_native_value)
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.entity_description.device_identifier)}
+        return self._device_info(self.entity_description.device_identifier)
+
+
+class AmitAnalyticsSensorEntity(AmitEntity, SensorEntity):
+    """Representation of a sensor derived from coordinator data.
+
+    Run times, the duty cycle and the time to setpoint keep moving while the
+    pages stay the same, so they are refreshed on a timer of their own too.
+    """
+
+    _attr_has_entity_name = True
+    _datasets = frozenset({"ventilation"})
+    entity_description: AmitAnalyticsSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: AmitHvacCoordinator,
+        entity_description: AmitAnalyticsSensorEntityDescription,
+        entry_id: str,
+    ) -> None:
+        """Set up the instance."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self._significant_change = entity_description.significant_change
+        self._attr_unique_id = f"{entry_id}-{entity_description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh the analytics periodically."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._async_refresh_analytics,
+                timedelta(seconds=ANALYTICS_REFRESH_INTERVAL),
+            )
         )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self._is_update_irrelevant():
+            return
+        self._async_refresh_analytics()
+
+    @callback
+    def _async_refresh_analytics(self, _now: datetime | None = None) -> None:
+        """Publish the current analytics."""
+        self._attr_native_value = self.entity_description.value_fn(
+            self.coordinator.analytics, self.coordinator.data
+        )
+        self._async_write_if_changed()
+
+    async def async_get_statistics(self, window: int | None = None) -> ServiceResponse:
+        """Refuse statistics, derived sensors keep no history."""
+        raise ServiceValidationError(f"{self.entity_id} keeps no history")
+
+    def _published_state(self) -> tuple:
+        """Return the values this entity publishes."""
+        return (self.available, self._attr_native_value)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return self._device_info(self.entity_description.device_identifier)
+
+
+class AmitPlcSensorEntity(AmitEntity, SensorEntity):
+    """Representation of a PLC traffic sensor.
+
+    The metrics move without the PLC data changing, so they are refreshed on
+    a timer of their own rather than only when the coordinator publishes.
+    """
+
+    _attr_has_entity_name = True
+    _datasets: frozenset[str] = frozenset()
+    entity_description: AmitPlcSensorEntityDescription
+
+    def __init__(
+        self,
+        api: AmitApi,
+        coordinator: AmitHvacCoordinator,
+        entity_description: AmitPlcSensorEntityDescription,
+        entry_id: str,
+    ) -> None:
+        """Set up the instance."""
+        super().__init__(coordinator)
+        self._api = api
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{entry_id}-{entity_description.key}"
+        self._attr_device_info = self._device_info(PLC_ID)
+        self._attr_native_value = entity_description.value_fn(api.metrics)
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh the metrics periodically."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._async_refresh_metrics,
+                timedelta(seconds=METRICS_REFRESH_INTERVAL),
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._attr_native_value = self.entity_description.value_fn(self._api.metrics)
+        self._async_write_if_changed()
+
+    @callback
+    def _async_refresh_metrics(self, _now: datetime) -> None:
+        """Publish the current metrics."""
+        self._handle_coordinator_update()
+
+    def _published_state(self) -> tuple:
+        """Return the values this entity publishes."""
+        return (self.available, self._attr_native_value)
+
+    async def async_get_statistics(self, window: int | None = None) -> ServiceResponse:
+        """Refuse statistics, PLC traffic counters keep no history."""
+        raise ServiceValidationError(f"{self.entity_id} keeps no history")
+
+
+def _round(value: float | None, digits: int) -> float | None:
+    """Round a statistic that may be missing."""
+    return None if value is None else round(value, digits)
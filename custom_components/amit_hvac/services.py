@@ -0,0 +1,90 @@
+"""Services of the Amit HVAC integration."""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from amit_hvac_control.models import HeatingMode, Season, VentilationMode
+
+from .api import (
+    REGISTER_HEATING_MODE,
+    REGISTER_SEASON,
+    REGISTER_TARGET_AIR_TEMPERATURE,
+    REGISTER_TARGET_CO2,
+    REGISTER_VENTILATION_MODE,
+    SCENE_ORDER,
+)
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    DOMAIN,
+    TARGET_AIR_TEMPERATURE_MAX,
+    TARGET_AIR_TEMPERATURE_MIN,
+    TARGET_CO2_MAX,
+    TARGET_CO2_MIN,
+)
+
+if TYPE_CHECKING:
+    from .api_helper import AmitApiHelper
+
+SERVICE_APPLY_SCENE = "apply_scene"
+
+
+def _enum_by_name(enum_type: type[Enum]) -> vol.All:
+    """Return a validator turning a lowercase member name into the member."""
+    return vol.All(
+        cv.string,
+        vol.Lower,
+        vol.In([member.name.lower() for member in enum_type]),
+        lambda name: enum_type[name.upper()],
+    )
+
+
+APPLY_SCENE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Optional(REGISTER_SEASON): _enum_by_name(Season),
+            vol.Optional(REGISTER_HEATING_MODE): _enum_by_name(HeatingMode),
+            vol.Optional(REGISTER_TARGET_AIR_TEMPERATURE): vol.All(
+                vol.Coerce(float),
+                vol.Range(
+                    min=TARGET_AIR_TEMPERATURE_MIN, max=TARGET_AIR_TEMPERATURE_MAX
+                ),
+            ),
+            vol.Optional(REGISTER_TARGET_CO2): vol.All(
+                vol.Coerce(float), vol.Range(min=TARGET_CO2_MIN, max=TARGET_CO2_MAX)
+            ),
+            vol.Optional(REGISTER_VENTILATION_MODE): _enum_by_name(VentilationMode),
+        }
+    ),
+    cv.has_at_least_one_key(*SCENE_ORDER),
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_apply_scene(call: ServiceCall) -> None:
+        """Write the values of a scene in one batch."""
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        helper: AmitApiHelper | None = hass.data.get(DOMAIN, {}).get(entry_id)
+        if helper is None:
+            raise ServiceValidationError(f"Config entry {entry_id} is not loaded")
+        values: dict[str, Any] = {
+            register: call.data[register]
+            for register in SCENE_ORDER
+            if register in call.data
+        }
+        await helper.api.async_apply_scene(values)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_APPLY_SCENE, async_apply_scene, schema=APPLY_SCENE_SCHEMA
+    )
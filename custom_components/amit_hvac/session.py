@@ -0,0 +1,136 @@
+"""Authenticated sessions to an Amit PLC."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from http import HTTPStatus
+import logging
+
+from aiohttp import BasicAuth, ClientResponseError, ClientSession, ClientTimeout
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.hass_dict import HassKey
+
+from amit_hvac_control.models import Config
+
+from .const import CONNECT_TIMEOUT, DOMAIN, LOGIN_HANDOFF_TIMEOUT, REQUEST_TIMEOUT
+from .metrics import PlcMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_LOGINS: HassKey[dict[str, PlcLogin]] = HassKey(f"{DOMAIN}_logins")
+
+
+class InvalidAuth(HomeAssistantError):
+    """Error to indicate there is invalid auth."""
+
+
+@dataclass
+class PlcLogin:
+    """A session authenticated against a PLC, with the metrics recording it."""
+
+    config: Config
+    session: ClientSession
+    metrics: PlcMetrics
+    cancel_expiry: CALLBACK_TYPE | None = None
+
+    def matches(self, config: Config) -> bool:
+        """Return whether the login is for a PLC with the same credentials."""
+        return (self.config.url, self.config.username, self.config.password) == (
+            config.url,
+            config.username,
+            config.password,
+        )
+
+
+@callback
+def async_create_plc_session(
+    hass: HomeAssistant, config: Config, metrics: PlcMetrics
+) -> ClientSession:
+    """Create a session to a PLC on Home Assistant's connection pool.
+
+    Connecting is bounded by a short timeout of its own, so an unreachable
+    host fails fast instead of waiting for the whole request timeout.
+    """
+    return async_create_clientsession(
+        hass,
+        auto_cleanup=False,
+        base_url=config.url,
+        auth=BasicAuth(config.username, config.password),
+        raise_for_status=True,
+        timeout=ClientTimeout(total=REQUEST_TIMEOUT, sock_connect=CONNECT_TIMEOUT),
+        trace_configs=[metrics.trace_config()],
+    )
+
+
+async def async_authenticate(session: ClientSession, metrics: PlcMetrics) -> None:
+    """Authenticate a session against the PLC."""
+    metrics.logins += 1
+    try:
+        async with session.get("/"):
+            pass
+    except ClientResponseError as err:
+        if err.status == HTTPStatus.UNAUTHORIZED:
+            raise InvalidAuth from err
+        raise
+
+
+async def async_login(hass: HomeAssistant, config: Config) -> PlcLogin:
+    """Open a session to a PLC and authenticate it."""
+    metrics = PlcMetrics()
+    session = async_create_plc_session(hass, config, metrics)
+    try:
+        await async_authenticate(session, metrics)
+    except BaseException:
+        session.detach()
+        raise
+    return PlcLogin(config, session, metrics)
+
+
+@callback
+def async_hand_over_login(hass: HomeAssistant, login: PlcLogin) -> None:
+    """Keep a login for the config entry about to be set up for its PLC.
+
+    A login nobody takes within LOGIN_HANDOFF_TIMEOUT seconds is released.
+    """
+    logins = hass.data.setdefault(DATA_LOGINS, {})
+    if (previous := logins.pop(login.config.url, None)) is not None:
+        _async_release_login(previous)
+
+    @callback
+    def _async_expire(_now) -> None:
+        if logins.get(login.config.url) is login:
+            del logins[login.config.url]
+            login.cancel_expiry = None
+            _async_release_login(login)
+
+    login.cancel_expiry = async_call_later(hass, LOGIN_HANDOFF_TIMEOUT, _async_expire)
+    logins[login.config.url] = login
+
+
+@callback
+def async_take_login(hass: HomeAssistant, config: Config) -> PlcLogin | None:
+    """Return the login handed over for a PLC, if its credentials match."""
+    logins = hass.data.get(DATA_LOGINS, {})
+    if (login := logins.pop(config.url, None)) is None:
+        return None
+    if login.cancel_expiry is not None:
+        login.cancel_expiry()
+        login.cancel_expiry = None
+    if not login.matches(config):
+        _async_release_login(login)
+        return None
+    _LOGGER.debug("Reusing the session validated for %s", config.url)
+    return login
+
+
+@callback
+def _async_release_login(login: PlcLogin) -> None:
+    """Release the session of a login, the connector is shared."""
+    if login.cancel_expiry is not None:
+        login.cancel_expiry()
+        login.cancel_expiry = None
+    login.session.detach()
@@ -0,0 +1,330 @@
+"""End-to-end benchmark of the integration against the PLC simulator.
+
+Boots Home Assistant in a temporary config directory, adds the integration
+through its config flow against `plc_simulator.py` and reports:
+
+- PLC requests and logins per poll cycle
+- latency and PLC requests per command, also while a poll is in flight
+- state writes per poll cycle and per minute at the configured interval
+- import time of the integration and of each platform (`python -X importtime`)
+
+Results are printed as JSON tagged with the current commit, so runs can be
+compared across commits: `python scripts/benchmark.py --output result.json`.
+The test suite runs these measurements against budgets, see
+`tests/test_benchmark.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+import json
+import logging
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+from aiohttp import web
+from plc_simulator import INDEX_URL, PlcSimulator
+
+from homeassistant import bootstrap, config_entries, loader
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.setup import async_setup_component
+
+ROOT = Path(__file__).resolve().parent.parent
+DOMAIN = "amit_hvac"
+# The integration's WRITE_COOLDOWN, not imported to keep the import timing clean
+WRITE_COOLDOWN = 1.0
+
+COMMANDS: list[tuple[str, str, str, dict[str, Any]]] = [
+    ("fan", "set_percentage", "fan.ventilation", {"percentage": 100}),
+    ("fan", "turn_off", "fan.ventilation", {}),
+    ("number", "set_value", "number.ventilation_target_co2", {"value": 900}),
+    (
+        "number",
+        "set_value",
+        "number.ventilation_target_temperature",
+        {"value": 22},
+    ),
+    ("climate", "set_hvac_mode", "climate.heating", {"hvac_mode": "auto"}),
+    ("climate", "set_fan_mode", "climate.ventilation", {"fan_mode": "auto"}),
+]
+
+
+def _git_revision() -> str:
+    """Return the commit being benchmarked."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=ROOT,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# Loaded by Home Assistant before any integration, excluded from import times
+PRELOADED_MODULES = (
+    "homeassistant.config_entries",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+)
+IMPORTED_MODULES = (
+    "custom_components.amit_hvac",
+    "custom_components.amit_hvac.config_flow",
+    "custom_components.amit_hvac.climate",
+    "custom_components.amit_hvac.fan",
+    "custom_components.amit_hvac.number",
+    "custom_components.amit_hvac.sensor",
+)
+IMPORT_MARKER = "-- integration imports --"
+
+
+def measure_import_times() -> dict[str, Any]:
+    """Return the import time of the integration modules in a fresh interpreter.
+
+    Each module is imported after the previous ones, so its time only covers
+    what it adds, like a platform loaded after the integration.
+    """
+    code = "; ".join(
+        [
+            *(f"import {module}" for module in PRELOADED_MODULES),
+            f"sys.stderr.write({IMPORT_MARKER!r} + '\\n')",
+            *(f"import {module}" for module in IMPORTED_MODULES),
+        ]
+    )
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; {code}"],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    ).stderr
+    times: dict[str, Any] = {}
+    imported: list[str] = []
+    for line in stderr.split(IMPORT_MARKER, 1)[1].splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        imported.append(name.strip())
+        if name.strip() in IMPORTED_MODULES and not name.startswith("  "):
+            times[name.strip()] = round(int(cumulative) / 1000, 1)
+    return {
+        "ms": times,
+        "total_ms": round(sum(times.values()), 1),
+        "modules": len(imported),
+        "html_parser": "bs4" in imported,
+    }
+
+
+async def _async_start_simulator(simulator: PlcSimulator, port: int) -> web.AppRunner:
+    """Serve the simulator on localhost."""
+    app_runner = web.AppRunner(simulator.create_app())
+    await app_runner.setup()
+    await web.TCPSite(app_runner, "127.0.0.1", port).start()
+    return app_runner
+
+
+async def _async_start_hass(config_dir: Path) -> HomeAssistant:
+    """Boot a bare Home Assistant core with the integration on its path."""
+    (config_dir / "custom_components").symlink_to(ROOT / "custom_components")
+    hass = HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await loader.async_get_custom_components(hass)
+    await bootstrap.async_load_base_functionality(hass)
+    await async_setup_component(hass, "homeassistant", {})
+    await hass.async_start()
+    return hass
+
+
+async def async_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmark and return its results."""
+    simulator = PlcSimulator(
+        latency=args.latency, failure_rate=args.failure_rate, jitter=args.jitter
+    )
+    app_runner = await _async_start_simulator(simulator, args.port)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _async_start_hass(Path(config_dir))
+
+        setup_started = time.perf_counter()
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": "user"},
+            data={
+                "host": f"http://127.0.0.1:{args.port}",
+                "username": simulator.username,
+                "password": simulator.password,
+            },
+        )
+        await hass.async_block_till_done()
+        setup_time = time.perf_counter() - setup_started
+        entry = result["result"]
+        setup_requests = sum(simulator.requests.values())
+        if args.change_detection:
+            hass.config_entries.async_update_entry(
+                entry, options={**entry.options, "change_detection": True}
+            )
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        state_writes: Counter[str] = Counter()
+
+        @callback
+        def _async_count_write(event: Event) -> None:
+            if event.data["entity_id"] in entity_ids:
+                state_writes[event.data["entity_id"]] += 1
+
+        entity_ids = set(hass.states.async_entity_ids())
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _async_count_write)
+        coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+        metrics = hass.data[DOMAIN][entry.entry_id].api.metrics
+
+        # Poll cycles
+        simulator.reset()
+        parse_cache = (metrics.parse_cache_hits, metrics.parse_cache_misses)
+        for _ in range(args.cycles):
+            # Age the previous reads by one interval, as if the timer had fired
+            for dataset, fetched_at in coordinator._fetched_at.items():  # noqa: SLF001
+                coordinator._fetched_at[dataset] = (  # noqa: SLF001
+                    fetched_at - coordinator.update_interval
+                )
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+        cycle_requests = Counter(simulator.requests)
+        parse_cache_hits = metrics.parse_cache_hits - parse_cache[0]
+        parsed = parse_cache_hits + metrics.parse_cache_misses - parse_cache[1]
+        cycle_state_writes = Counter(state_writes)
+        cycle_writes = sum(cycle_state_writes.values())
+        interval = coordinator.update_interval.total_seconds()
+
+        # Commands
+        commands = {}
+        for domain, service, entity_id, data in COMMANDS:
+            simulator.reset()
+            latencies = []
+            for _ in range(args.repeat):
+                # Measure single commands, not bursts coalesced by the cooldown
+                await asyncio.sleep(WRITE_COOLDOWN)
+                started = time.perf_counter()
+                await hass.services.async_call(
+                    domain,
+                    service,
+                    {"entity_id": entity_id, **data},
+                    blocking=True,
+                )
+                latencies.append(time.perf_counter() - started)
+            await hass.async_block_till_done(wait_background_tasks=True)
+            commands[f"{domain}.{service} {entity_id}"] = {
+                "latency_ms": round(statistics.median(latencies) * 1000, 1),
+                "requests": round(sum(simulator.requests.values()) / args.repeat, 2),
+            }
+
+        # A command whose write is sent while a poll is in flight
+        await asyncio.sleep(WRITE_COOLDOWN)
+        for dataset, fetched_at in coordinator._fetched_at.items():  # noqa: SLF001
+            coordinator._fetched_at[dataset] = (  # noqa: SLF001
+                fetched_at - coordinator.max_interval
+            )
+        poll = hass.async_create_task(coordinator.async_refresh())
+        await asyncio.sleep(args.latency / 2)  # the poll holds every slot
+        started = time.perf_counter()
+        await hass.services.async_call(
+            "number",
+            "set_value",
+            {"entity_id": "number.ventilation_target_co2", "value": 850},
+            blocking=True,
+        )
+        command_latency = time.perf_counter() - started
+        await poll
+        command_during_poll = {
+            "latency_ms": round(command_latency * 1000, 1),
+            "polls_preempted": coordinator.amit_api.metrics.preempted,
+        }
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        # Restart, restoring the data saved by the run above
+        await hass.config_entries.async_unload(entry.entry_id)
+        simulator.reset()
+        restart_started = time.perf_counter()
+        await hass.config_entries.async_setup(entry.entry_id)
+        restart_time = time.perf_counter() - restart_started
+        restart_requests = sum(simulator.requests.values())
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop()
+
+    await app_runner.cleanup()
+
+    return {
+        "revision": _git_revision(),
+        "latency_s": args.latency,
+        "change_detection": args.change_detection,
+        "setup": {
+            "seconds": round(setup_time, 3),
+            "requests": setup_requests,
+        },
+        "restart": {
+            "seconds": round(restart_time, 3),
+            "requests": restart_requests,
+        },
+        "poll": {
+            "cycles": args.cycles,
+            "requests_per_cycle": round(sum(cycle_requests.values()) / args.cycles, 2),
+            "requests_per_minute": round(
+                sum(cycle_requests.values()) / args.cycles * 60 / interval, 2
+            ),
+            "logins_per_cycle": round(
+                cycle_requests[f"GET {INDEX_URL}"] / args.cycles, 2
+            ),
+            "requests": dict(cycle_requests),
+            "parse_cache_hit_rate": (
+                round(parse_cache_hits / parsed, 2) if parsed else None
+            ),
+            "state_writes": dict(cycle_state_writes),
+            "state_writes_per_cycle": round(cycle_writes / args.cycles, 2),
+            "state_writes_per_minute": round(
+                cycle_writes / args.cycles * 60 / interval, 2
+            ),
+        },
+        "commands": commands,
+        "command_during_poll": command_during_poll,
+        "imports": measure_import_times(),
+    }
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per command")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="0..1")
+    parser.add_argument("--jitter", action="store_true", help="drift CO2/air temp")
+    parser.add_argument(
+        "--change-detection", action="store_true", help="poll in change detection mode"
+    )
+    parser.add_argument("--output", type=Path, help="also write results here")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = asyncio.run(async_benchmark(args))
+    text = json.dumps(results, indent=2)
+    print(text)  # noqa: T201
+    if args.output:
+        args.output.write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
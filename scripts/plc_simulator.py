@@ -0,0 +1,266 @@
+"""Local stand-in for the AMiNi4W2 PLC web server.
+
+Serves the pages `amit_hvac_control` reads and writes (overview, heating and
+ventilation) with HTTP basic auth, so the integration can be developed and
+benchmarked without the hardware. Latency and failures can be injected, and
+every request is counted per endpoint.
+
+Run standalone with `python scripts/plc_simulator.py --port 8080`, the
+counters are served as JSON on `/_stats` and cleared with `POST /_reset`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+import random
+
+from aiohttp import BasicAuth, hdrs, web
+
+INDEX_URL = "/"
+OVERVIEW_URL = "/pages/index.hta"
+HEATING_URL = "/pages/page00/Vytapeni.hta"
+VENTILATION_URL = "/pages/page00/Page002.hta"
+
+# Ventilation mode (OFF, LOW, MEDIUM, HIGH, AUTO) selected by each submit button
+VENTILATION_BUTTONS = {
+    "BTNSUB_g2": 0,
+    "BTNSUB_g3": 1,
+    "BTNSUB_g4": 2,
+    "BTNSUB_g5": 3,
+    "BTNSUB_g6": 4,
+}
+# Heating mode (SCHEDULED, MINIMAL, COMFORT) selected by each submit button
+HEATING_BUTTONS = {
+    "BTNSUB_g3": 2,
+    "BTNSUB_g4": 1,
+    "BTNSUB_g5": 0,
+}
+
+
+@dataclass
+class PlcState:
+    """Process values held by the simulated PLC."""
+
+    season: int = 1
+    ventilation_mode: int = 1
+    heating_mode: int = 2
+    room_temperature: float = 21.5
+    comfort_temperature: float = 22.0
+    minimal_temperature: float = 18.0
+    air_temperature: float = 20.5
+    air_temp_setpoint: float = 21.0
+    # None on a unit without a CO2 probe
+    co2: int | None = 650
+    co2_setpoint: float | None = 800.0
+    heating_level: float = 0.0
+
+    @property
+    def ventilation_speed(self) -> int:
+        """Return the running fan speed, AUTO runs on low."""
+        return 1 if self.ventilation_mode == 4 else self.ventilation_mode
+
+
+def _co2_view(index: int, co2: int | None) -> str:
+    """Return the numeric view of the CO2 reading, none without a probe."""
+    return "" if co2 is None else f'<span class="AWNumericView{index}">{co2}</span>'
+
+
+def _co2_setpoint_input(setpoint: float | None) -> str:
+    """Return the edit input of the CO2 setpoint, none without a probe."""
+    if setpoint is None:
+        return ""
+    return f'<input class="AWNumericEditButton2" value="{setpoint:.0f}">'
+
+
+@dataclass
+class PlcSimulator:
+    """Simulated PLC web server."""
+
+    username: str = "admin"
+    password: str = "admin"
+    latency: float = 0.0
+    failure_rate: float = 0.0
+    jitter: bool = False
+    state: PlcState = field(default_factory=PlcState)
+    requests: Counter[str] = field(default_factory=Counter)
+    bytes_sent: int = 0
+
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get(INDEX_URL, self._handle_index)
+        app.router.add_get(OVERVIEW_URL, self._handle_overview)
+        app.router.add_get(HEATING_URL, self._handle_heating)
+        app.router.add_post(HEATING_URL, self._handle_heating_post)
+        app.router.add_get(VENTILATION_URL, self._handle_ventilation)
+        app.router.add_post(VENTILATION_URL, self._handle_ventilation_post)
+        app.router.add_get("/_stats", self._handle_stats)
+        app.router.add_post("/_reset", self._handle_reset)
+        return app
+
+    def reset(self) -> None:
+        """Clear the request counters."""
+        self.requests.clear()
+        self.bytes_sent = 0
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        """Count, delay, fail and authenticate PLC requests."""
+        if request.path.startswith("/_"):
+            return await handler(request)
+
+        self.requests[f"{request.method} {request.path}"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise web.HTTPServiceUnavailable
+
+        try:
+            auth = BasicAuth.decode(request.headers.get(hdrs.AUTHORIZATION, ""))
+        except ValueError:
+            auth = None
+        if auth is None or (auth.login, auth.password) != (
+            self.username,
+            self.password,
+        ):
+            raise web.HTTPUnauthorized(headers={hdrs.WWW_AUTHENTICATE: "Basic"})
+
+        response = await handler(request)
+        if response.body is not None:
+            self.bytes_sent += len(response.body)
+        return response
+
+    def _drift(self) -> None:
+        """Let the measured values wander like a real room would."""
+        if not self.jitter:
+            return
+        if self.state.co2 is not None:
+            self.state.co2 = max(400, self.state.co2 + random.randint(-3, 3))
+        self.state.air_temperature = round(
+            self.state.air_temperature + random.choice((-0.1, 0, 0.1)), 1
+        )
+
+    async def _handle_index(self, request: web.Request) -> web.Response:
+        return web.Response(text="<html><body>AMiNi4W2</body></html>")
+
+    async def _handle_overview(self, request: web.Request) -> web.Response:
+        self._drift()
+        state = self.state
+        return web.Response(
+            content_type="text/html",
+            text=f"""<html><body>
+<span class="AWNumericView1">{state.room_temperature:.1f}</span>
+{_co2_view(2, state.co2)}
+<span class="AWNumericView3">{state.air_temperature:.1f}</span>
+<script>
+var AWSCaseLabel1v={state.season};
+var AWSCaseLabel2v={state.ventilation_mode};
+var AWSCaseLabel3v={state.heating_mode};
+</script>
+</body></html>""",
+        )
+
+    async def _handle_heating(self, request: web.Request) -> web.Response:
+        state = self.state
+        set_temperature = (
+            state.minimal_temperature
+            if state.heating_mode == 1
+            else state.comfort_temperature
+        )
+        return web.Response(
+            content_type="text/html",
+            text=f"""<html><body>
+<span class="AWNumericView1">{state.room_temperature:.1f}</span>
+<span class="AWNumericView2">{set_temperature:.1f}</span>
+<script>
+var AWSCaseImage1v={state.heating_mode};
+</script>
+</body></html>""",
+        )
+
+    async def _handle_ventilation(self, request: web.Request) -> web.Response:
+        self._drift()
+        state = self.state
+        speed = state.ventilation_speed
+        heating_bit = 1 if state.heating_level > 0 else 0
+        return web.Response(
+            content_type="text/html",
+            text=f"""<html><body>
+{_co2_view(1, state.co2)}
+<span class="AWNumericView2">{state.air_temperature:.1f}</span>
+<input class="AWNumericEditButton1" value="{state.air_temp_setpoint:.2f}">
+{_co2_setpoint_input(state.co2_setpoint)}
+<script>
+var AWSCaseLabel1v={state.ventilation_mode};
+var AWProgressBar1v={state.heating_level:.1f};
+AWSCaseLabelBit1_v = ({heating_bit}&1)
+AWSCaseLabelBit2_v = ({int(speed == 1)}&1)
+AWSCaseLabelBit3_v = ({int(speed == 2)}&1)
+AWSCaseLabelBit4_v = ({int(speed == 3)}&1)
+</script>
+</body></html>""",
+        )
+
+    async def _handle_heating_post(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        state = self.state
+        for key, value in form.items():
+            if key in HEATING_BUTTONS:
+                state.heating_mode = HEATING_BUTTONS[key]
+            elif key.startswith("NUMEDIT_i1w4101"):
+                state.comfort_temperature = float(value)
+            elif key.startswith("NUMEDIT_i1w4102"):
+                state.minimal_temperature = float(value)
+            elif key.startswith("BITEDIT_i1w4097"):
+                state.season = 1 if value == "1" else 0
+        return await self._handle_heating(request)
+
+    async def _handle_ventilation_post(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        state = self.state
+        for key, value in form.items():
+            if key in VENTILATION_BUTTONS:
+                state.ventilation_mode = VENTILATION_BUTTONS[key]
+            elif key.startswith("NUMEDIT_i1w4095"):
+                state.air_temp_setpoint = float(value)
+            elif key.startswith("NUMEDIT_i1w4087"):
+                state.co2_setpoint = float(value)
+        return await self._handle_ventilation(request)
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"requests": dict(self.requests), "bytes_sent": self.bytes_sent}
+        )
+
+    async def _handle_reset(self, request: web.Request) -> web.Response:
+        self.reset()
+        return web.Response()
+
+
+def main() -> None:
+    """Run the simulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="0..1")
+    parser.add_argument("--jitter", action="store_true", help="drift CO2/air temp")
+    args = parser.parse_args()
+
+    simulator = PlcSimulator(
+        username=args.username,
+        password=args.password,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        jitter=args.jitter,
+    )
+    web.run_app(simulator.create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Fixtures for the Amit HVAC tests.
+
+The integration talks to `PlcSimulator`, the stand-in PLC web server of the
+scripts directory, served on localhost for each test.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Generator
+from pathlib import Path
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.resolver import ThreadedResolver
+from plc_simulator import PlcSimulator
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from custom_components.amit_hvac.const import DOMAIN
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_page(name: str) -> bytes:
+    """Return the content of a saved PLC page."""
+    return (FIXTURES / name).read_bytes()
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable the integration in every test."""
+
+
+@pytest.fixture(autouse=True)
+def threaded_resolver() -> Generator[None]:
+    """Resolve without aiodns, its shutdown thread outlives the test."""
+    with patch("homeassistant.helpers.aiohttp_client.AsyncResolver", ThreadedResolver):
+        yield
+
+
+@pytest.fixture
+def plc() -> PlcSimulator:
+    """Return the state and request counters of the simulated PLC."""
+    return PlcSimulator()
+
+
+@pytest.fixture
+async def plc_url(plc: PlcSimulator, socket_enabled: None) -> AsyncGenerator[str]:
+    """Serve the simulated PLC on a free localhost port."""
+    runner = web.AppRunner(plc.create_app())
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    host, port = runner.addresses[0][:2]
+    yield f"http://{host}:{port}"
+    await runner.cleanup()
+
+
+@pytest.fixture
+def config_entry(
+    hass: HomeAssistant, plc: PlcSimulator, plc_url: str
+) -> MockConfigEntry:
+    """Return a config entry for the simulated PLC."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="AMiT Hub",
+        unique_id=plc_url,
+        data={
+            CONF_HOST: plc_url,
+            CONF_USERNAME: plc.username,
+            CONF_PASSWORD: plc.password,
+        },
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def init_integration(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> AsyncGenerator[MockConfigEntry]:
+    """Set up the integration against the simulated PLC."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    yield config_entry
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
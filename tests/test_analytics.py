@@ -0,0 +1,112 @@
+"""Tests for the analytics derived from PLC readings."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+import math
+
+from amit_hvac_control.models import VentilationMode
+import pytest
+
+from custom_components.amit_hvac.analytics import (
+    AmitAnalytics,
+    DutyCycle,
+    RateTracker,
+    RunTimeCounter,
+)
+from custom_components.amit_hvac.bulk import (
+    parse_heating,
+    parse_overview,
+    parse_ventilation,
+)
+from custom_components.amit_hvac.coordinator import AmitHvacData
+
+from .conftest import load_page
+
+
+def _data(**ventilation) -> AmitHvacData:
+    """Return a snapshot of the saved pages with changed ventilation values."""
+    return AmitHvacData(
+        overview=parse_overview(load_page("overview.hta")),
+        heating=parse_heating(load_page("heating.hta")),
+        ventilation=replace(
+            parse_ventilation(load_page("ventilation.hta")), **ventilation
+        ),
+    )
+
+
+def test_rate_tracker() -> None:
+    """Test the first rate is taken as is and later ones are smoothed."""
+    tracker = RateTracker(time_constant=300)
+    tracker.update(0, 600)
+    assert tracker.rate is None
+
+    tracker.update(60, 660)
+    assert tracker.rate == 1
+
+    tracker.update(360, 660)
+    assert tracker.rate == pytest.approx(math.exp(-1))
+
+
+def test_rate_tracker_skips_gaps() -> None:
+    """Test missing readings and repeated timestamps are ignored."""
+    tracker = RateTracker(time_constant=300)
+    tracker.update(0, 600)
+    tracker.update(30, None)
+    tracker.update(0, 700)
+    assert tracker.rate is None
+
+    tracker.update(100, 800)
+    assert tracker.rate == 1
+
+
+def test_duty_cycle() -> None:
+    """Test the duty cycle weighs each state by how long it held."""
+    duty_cycle = DutyCycle(time_constant=3600)
+    duty_cycle.update(0, True)
+    duty_cycle.update(60, False)
+    assert duty_cycle.duty == 1
+
+    duty_cycle.update(3660, False)
+    assert duty_cycle.duty == pytest.approx(math.exp(-1))
+
+
+def test_run_time_counter() -> None:
+    """Test the time until the next reading is counted for the previous state."""
+    counter = RunTimeCounter()
+    counter.update(0, VentilationMode.LOW)
+    counter.update(60, VentilationMode.HIGH)
+    counter.update(90, VentilationMode.LOW)
+    counter.update(100, VentilationMode.LOW)
+
+    assert counter.seconds == {VentilationMode.LOW: 70, VentilationMode.HIGH: 30}
+
+
+def test_time_to_setpoint() -> None:
+    """Test the time to reach the air temperature setpoint at the current rate."""
+    analytics = AmitAnalytics()
+    analytics.update(0, _data(air_temp_current=20.0))
+    assert analytics.time_to_setpoint(_data(air_temp_current=20.0)) is None
+
+    data = _data(air_temp_current=20.5)
+    analytics.update(600, data)
+    # 0.5 degrees in 10 minutes, 1 degree to the 21.5 setpoint
+    assert analytics.time_to_setpoint(data) == pytest.approx(1200)
+
+    cooling = _data(air_temp_current=20.0)
+    analytics.update(1200, cooling)
+    analytics.update(1800, cooling)
+    assert analytics.time_to_setpoint(cooling) is None
+
+    assert analytics.time_to_setpoint(_data(air_temp_current=21.5)) == 0
+
+
+def test_analytics_update() -> None:
+    """Test every tracker is fed from the ventilation page."""
+    analytics = AmitAnalytics()
+    analytics.update(0, _data(co2_current=1000.0, heating_on=True))
+    analytics.update(60, _data(co2_current=1060.0, heating_on=False))
+
+    assert analytics.co2_rate.rate == 1
+    assert analytics.heating_duty_cycle.duty == 1
+    assert analytics.fan_run_time.seconds == {VentilationMode.AUTO: 60}
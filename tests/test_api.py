@@ -0,0 +1,173 @@
+"""Tests for the Amit API against the simulated PLC."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+from amit_hvac_control.models import VentilationMode
+from plc_simulator import VENTILATION_URL, PlcSimulator
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.amit_hvac.api import AmitApi
+from custom_components.amit_hvac.breaker import BreakerState, PlcUnavailable
+from custom_components.amit_hvac.bulk import BulkParseError
+from custom_components.amit_hvac.const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BULK_READ_FAILURE_THRESHOLD,
+    DOMAIN,
+)
+
+POST_VENTILATION = f"POST {VENTILATION_URL}"
+
+
+@pytest.fixture
+def api(hass: HomeAssistant, init_integration: MockConfigEntry) -> AmitApi:
+    """Return the API of the set up entry."""
+    return hass.data[DOMAIN][init_integration.entry_id].api
+
+
+@pytest.fixture(autouse=True)
+def short_cooldown():
+    """Shorten the write cooldown so the tests do not wait for it."""
+    with patch("custom_components.amit_hvac.api.WRITE_COOLDOWN", 0.2):
+        yield
+
+
+async def test_first_write_sent_at_once(
+    hass: HomeAssistant, plc: PlcSimulator, api: AmitApi
+) -> None:
+    """Test a write is not held back by the cooldown."""
+    with patch("custom_components.amit_hvac.api.WRITE_COOLDOWN", 60):
+        async with asyncio.timeout(1):
+            await api.async_set_target_co2(900)
+
+    assert plc.state.co2_setpoint == 900
+    await hass.async_block_till_done()
+
+
+async def test_writes_coalesced_during_cooldown(
+    hass: HomeAssistant, plc: PlcSimulator, api: AmitApi
+) -> None:
+    """Test writes arriving during the cooldown go out once per register."""
+    await api.async_set_target_co2(900)
+    plc.reset()
+
+    async with asyncio.timeout(2):
+        await asyncio.gather(
+            api.async_set_target_co2(950),
+            api.async_set_target_co2(1000),
+            api.async_set_ventilation(VentilationMode.HIGH),
+        )
+
+    assert plc.requests[POST_VENTILATION] == 2
+    assert plc.state.co2_setpoint == 1000
+    assert plc.state.ventilation_mode == VentilationMode.HIGH.value
+    await hass.async_block_till_done()
+
+
+async def test_write_during_flush(
+    hass: HomeAssistant, plc: PlcSimulator, api: AmitApi
+) -> None:
+    """Test a write queued while a flush and its verify read run is sent."""
+    plc.latency = 0.05
+    first = hass.async_create_task(api.async_set_target_co2(900))
+    await asyncio.sleep(0.02)
+    second = hass.async_create_task(api.async_set_target_co2(950))
+
+    async with asyncio.timeout(2):
+        await first
+        # The verify read of the first write is now in flight
+        await api.async_set_target_air_temperature(22)
+        await second
+
+    assert plc.state.co2_setpoint == 950
+    assert plc.state.air_temp_setpoint == 22
+    await hass.async_block_till_done()
+
+
+async def test_close_fails_queued_writes(
+    hass: HomeAssistant, plc: PlcSimulator, api: AmitApi
+) -> None:
+    """Test closing the API fails writes that were not sent."""
+    plc.latency = 0.05
+    first = hass.async_create_task(api.async_set_target_co2(900))
+    await asyncio.sleep(0.02)
+    queued = hass.async_create_task(api.async_set_target_co2(950))
+    await asyncio.sleep(0)
+
+    await api.async_close()
+
+    for write in (first, queued):
+        with pytest.raises(HomeAssistantError, match="closed"):
+            await write
+    assert plc.state.co2_setpoint != 950
+
+
+async def test_breaker_stops_requests(
+    hass: HomeAssistant, plc: PlcSimulator, api: AmitApi
+) -> None:
+    """Test an unreachable PLC trips the breaker and one probe closes it."""
+    plc.failure_rate = 1
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        result = (await api.async_read(["overview"]))["overview"]
+        assert not isinstance(result, PlcUnavailable)
+    assert api.breaker.state is BreakerState.OPEN
+
+    plc.reset()
+    result = (await api.async_read(["overview"]))["overview"]
+    assert isinstance(result, PlcUnavailable)
+    with pytest.raises(PlcUnavailable):
+        await api.async_set_target_co2(900)
+    assert not plc.requests
+
+    plc.failure_rate = 0
+    api.breaker.retry_at = 0
+    results = await api.async_read(["overview", "heating", "ventilation"])
+    assert not any(isinstance(result, Exception) for result in results.values())
+    assert api.breaker.state is BreakerState.CLOSED
+
+
+async def test_bulk_read_survives_a_garbled_page(
+    hass: HomeAssistant, plc: PlcSimulator, api: AmitApi
+) -> None:
+    """Test bulk reads are only turned off after repeated parse failures."""
+    parse = api._parse_cache.parse
+    failures = BULK_READ_FAILURE_THRESHOLD - 1
+
+    def garble(dataset: str, content: bytes):
+        nonlocal failures
+        if failures:
+            failures -= 1
+            raise BulkParseError("garbled")
+        return parse(dataset, content)
+
+    with patch.object(api._parse_cache, "parse", garble):
+        for _ in range(BULK_READ_FAILURE_THRESHOLD):
+            assert (await api.async_read(["overview"]))["overview"].co_2 == 650
+        assert api.bulk_read
+
+        failures = BULK_READ_FAILURE_THRESHOLD
+        for _ in range(BULK_READ_FAILURE_THRESHOLD):
+            assert (await api.async_read(["overview"]))["overview"].co_2 == 650
+    assert not api.bulk_read
+
+
+async def test_unchanged_page_reuses_result(
+    hass: HomeAssistant, plc: PlcSimulator, api: AmitApi
+) -> None:
+    """Test reading an unchanged page returns the cached result."""
+    first = (await api.async_read(["overview"]))["overview"]
+    hits = api.metrics.parse_cache_hits
+
+    assert (await api.async_read(["overview"]))["overview"] is first
+    assert api.metrics.parse_cache_hits == hits + 1
+
+    plc.state.co2 = 700
+    changed = (await api.async_read(["overview"]))["overview"]
+    assert changed.co_2 == 700
+    assert api.metrics.parse_cache_hits == hits + 1
@@ -0,0 +1,173 @@
+"""Benchmarks of the integration against the simulated PLC.
+
+The measurements of `scripts/benchmark.py`, held to budgets so a regression
+fails the suite. Each measurement is also recorded as a property of its test,
+`pytest -m benchmark --junitxml=...` collects them for comparison across runs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import statistics
+import time
+from typing import Any
+from unittest.mock import patch
+
+from benchmark import COMMANDS, measure_import_times
+from plc_simulator import INDEX_URL, PlcSimulator
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+
+from custom_components.amit_hvac.api_helper import AmitApiHelper
+from custom_components.amit_hvac.const import DOMAIN
+
+pytestmark = pytest.mark.benchmark
+
+# Seconds each simulated PLC request takes, like a PLC on the local network
+PLC_LATENCY = 0.05
+CYCLES = 5
+REPEAT = 3
+# A command is sent at once, it is neither held back by the write cooldown nor
+# by a poll in flight
+COMMAND_LATENCY_BUDGET = 0.5
+# The write and the read verifying it
+COMMAND_REQUESTS_BUDGET = 2
+# Generous for slow CI runners, the integration imports in about 0.1 second
+IMPORT_TIME_BUDGET_MS = 1000
+WRITE_COOLDOWN = 0.1
+
+
+@pytest.fixture
+def plc() -> PlcSimulator:
+    """Return a simulated PLC answering with a network delay."""
+    return PlcSimulator(latency=PLC_LATENCY)
+
+
+@pytest.fixture(autouse=True)
+def short_cooldown():
+    """Shorten the write cooldown the commands are spaced by."""
+    with patch("custom_components.amit_hvac.api.WRITE_COOLDOWN", WRITE_COOLDOWN):
+        yield
+
+
+def _helper(hass: HomeAssistant, entry: MockConfigEntry) -> AmitApiHelper:
+    """Return the API helper of a set up entry."""
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+async def test_poll_cycle(
+    hass: HomeAssistant,
+    plc: PlcSimulator,
+    init_integration: MockConfigEntry,
+    record_property: Callable[[str, Any], None],
+) -> None:
+    """Test a poll of unchanged pages reads each page once and writes no state."""
+    helper = _helper(hass, init_integration)
+    coordinator = helper.coordinator
+    metrics = helper.api.metrics
+    state_writes = []
+    hass.bus.async_listen(EVENT_STATE_CHANGED, state_writes.append)
+
+    plc.reset()
+    parse_cache_hits = metrics.parse_cache_hits
+    for _ in range(CYCLES):
+        # Age the previous reads by one interval, as if the timer had fired
+        for dataset, fetched_at in coordinator._fetched_at.items():
+            coordinator._fetched_at[dataset] = fetched_at - coordinator.update_interval
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    requests_per_cycle = sum(plc.requests.values()) / CYCLES
+    record_property("requests_per_cycle", round(requests_per_cycle, 2))
+    record_property(
+        "requests_per_minute",
+        round(requests_per_cycle * 60 / coordinator.update_interval.total_seconds(), 2),
+    )
+    assert 0 < requests_per_cycle <= 3
+    assert plc.requests[f"GET {INDEX_URL}"] == 0
+    assert metrics.parse_cache_hits - parse_cache_hits == sum(plc.requests.values())
+    assert state_writes == []
+
+
+@pytest.mark.parametrize(
+    ("domain", "service", "entity_id", "data"),
+    COMMANDS,
+    ids=[f"{domain}.{service}" for domain, service, _, _ in COMMANDS],
+)
+async def test_command(
+    hass: HomeAssistant,
+    plc: PlcSimulator,
+    init_integration: MockConfigEntry,
+    record_property: Callable[[str, Any], None],
+    domain: str,
+    service: str,
+    entity_id: str,
+    data: dict[str, Any],
+) -> None:
+    """Test a command is sent at once with a single write and verify read."""
+    # The first write imports the page-based library
+    await _helper(hass, init_integration).api._async_load_page_apis()
+
+    plc.reset()
+    latencies = []
+    for _ in range(REPEAT):
+        # Measure single commands, not bursts coalesced by the cooldown
+        await asyncio.sleep(WRITE_COOLDOWN)
+        started = time.perf_counter()
+        await hass.services.async_call(
+            domain, service, {"entity_id": entity_id, **data}, blocking=True
+        )
+        latencies.append(time.perf_counter() - started)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    latency = statistics.median(latencies)
+    requests = sum(plc.requests.values()) / REPEAT
+    record_property("latency_ms", round(latency * 1000, 1))
+    record_property("requests", requests)
+    assert latency < COMMAND_LATENCY_BUDGET
+    assert requests <= COMMAND_REQUESTS_BUDGET
+
+
+async def test_command_during_poll(
+    hass: HomeAssistant,
+    plc: PlcSimulator,
+    init_integration: MockConfigEntry,
+    record_property: Callable[[str, Any], None],
+) -> None:
+    """Test a command sent while a poll holds every slot preempts the poll."""
+    helper = _helper(hass, init_integration)
+    coordinator = helper.coordinator
+    await helper.api._async_load_page_apis()
+
+    for dataset, fetched_at in coordinator._fetched_at.items():
+        coordinator._fetched_at[dataset] = fetched_at - coordinator.max_interval
+    poll = hass.async_create_task(coordinator.async_refresh())
+    await asyncio.sleep(PLC_LATENCY / 2)
+    started = time.perf_counter()
+    await hass.services.async_call(
+        "number",
+        "set_value",
+        {"entity_id": "number.ventilation_target_co2", "value": 850},
+        blocking=True,
+    )
+    latency = time.perf_counter() - started
+    await poll
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    record_property("latency_ms", round(latency * 1000, 1))
+    assert latency < COMMAND_LATENCY_BUDGET
+    assert helper.api.metrics.preempted == 1
+
+
+def test_import_time(record_property: Callable[[str, Any], None]) -> None:
+    """Test the integration imports quickly and without the HTML parser."""
+    imports = measure_import_times()
+
+    for module, milliseconds in imports["ms"].items():
+        record_property(f"import_ms {module}", milliseconds)
+    assert not imports["html_parser"]
+    assert imports["total_ms"] < IMPORT_TIME_BUDGET_MS
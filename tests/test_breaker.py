@@ -0,0 +1,114 @@
+"""Tests for the circuit breaker."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from custom_components.amit_hvac.breaker import (
+    BreakerState,
+    CircuitBreaker,
+    PlcUnavailable,
+)
+from custom_components.amit_hvac.const import (
+    BREAKER_BASE_BACKOFF,
+    BREAKER_FAILURE_THRESHOLD,
+)
+
+
+def _trip(breaker: CircuitBreaker) -> None:
+    """Fail requests until the breaker opens."""
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        breaker.record_failure(TimeoutError())
+
+
+def _elapse_backoff(breaker: CircuitBreaker) -> None:
+    """Let the backoff of an open breaker run out."""
+    breaker.retry_at = time.monotonic() - 1
+
+
+async def test_trips_after_consecutive_failures() -> None:
+    """Test the breaker opens after the threshold and fails requests fast."""
+    breaker = CircuitBreaker("PLC")
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure(TimeoutError())
+    assert breaker.state is BreakerState.CLOSED
+    await breaker.async_before_request()
+
+    breaker.record_failure(TimeoutError())
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.trips == 1
+    assert (
+        BREAKER_BASE_BACKOFF / 2
+        <= breaker.retry_at - time.monotonic()
+        <= BREAKER_BASE_BACKOFF
+    )
+    with pytest.raises(PlcUnavailable, match="TimeoutError"):
+        await breaker.async_before_request()
+
+
+async def test_success_resets_failures() -> None:
+    """Test only consecutive failures count."""
+    breaker = CircuitBreaker("PLC")
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure(TimeoutError())
+    breaker.record_success()
+    breaker.record_failure(TimeoutError())
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.failures == 1
+
+
+async def test_successful_probe_closes() -> None:
+    """Test one probe goes out after the backoff, the others wait for it."""
+    breaker = CircuitBreaker("PLC")
+    _trip(breaker)
+    _elapse_backoff(breaker)
+
+    await breaker.async_before_request()
+    assert breaker.state is BreakerState.HALF_OPEN
+    waiting = asyncio.create_task(breaker.async_before_request())
+    await asyncio.sleep(0)
+    assert not waiting.done()
+
+    breaker.record_success()
+    await waiting
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.trips == 0
+
+
+async def test_failed_probe_backs_off_longer() -> None:
+    """Test a failed probe reopens the breaker with a doubled backoff."""
+    breaker = CircuitBreaker("PLC")
+    _trip(breaker)
+    _elapse_backoff(breaker)
+
+    await breaker.async_before_request()
+    waiting = asyncio.create_task(breaker.async_before_request())
+    await asyncio.sleep(0)
+    breaker.record_failure(TimeoutError())
+
+    with pytest.raises(PlcUnavailable):
+        await waiting
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.trips == 2
+    assert (
+        BREAKER_BASE_BACKOFF
+        <= breaker.retry_at - time.monotonic()
+        <= 2 * BREAKER_BASE_BACKOFF
+    )
+
+
+async def test_cancelled_probe_lets_the_next_request_probe() -> None:
+    """Test a cancelled probe does not leave the breaker half open."""
+    breaker = CircuitBreaker("PLC")
+    _trip(breaker)
+    _elapse_backoff(breaker)
+
+    await breaker.async_before_request()
+    breaker.record_cancelled()
+    assert breaker.state is BreakerState.OPEN
+
+    await breaker.async_before_request()
+    assert breaker.state is BreakerState.HALF_OPEN
@@ -0,0 +1,172 @@
+"""Tests for the bulk page parsers and their cache."""
+
+from __future__ import annotations
+
+from amit_hvac_control.api.status import StatusApi
+from amit_hvac_control.api.temperature import TemperatureApi
+from amit_hvac_control.api.ventilation import VentilationApi
+from amit_hvac_control.models import HeatingMode, Season, VentilationMode
+import pytest
+
+from custom_components.amit_hvac import fallback
+from custom_components.amit_hvac.bulk import (
+    BulkParseError,
+    ParseCache,
+    parse_heating,
+    parse_overview,
+    parse_ventilation,
+)
+from custom_components.amit_hvac.results import (
+    DataResult,
+    TemperatureResult,
+    VentilationResult,
+)
+
+from .conftest import load_page
+
+
+def test_parse_overview() -> None:
+    """Test the overview page, with the CO2 reading over its alarm limit."""
+    assert parse_overview(load_page("overview.hta")) == DataResult(
+        temperature=21.5,
+        air_temperature=20.5,
+        co_2=1250,
+        ventilation_mode=VentilationMode.AUTO,
+        season=Season.WINTER,
+        heating_mode=HeatingMode.COMFORT,
+    )
+
+
+def test_parse_heating() -> None:
+    """Test the heating page."""
+    assert parse_heating(load_page("heating.hta")) == TemperatureResult(
+        actual_temperature=21.5,
+        set_temperature=18.0,
+        heating_mode=HeatingMode.MINIMAL,
+    )
+
+
+def test_parse_ventilation() -> None:
+    """Test the ventilation page, running on auto with the heater on."""
+    assert parse_ventilation(load_page("ventilation.hta")) == VentilationResult(
+        ventilation_mode=VentilationMode.AUTO,
+        ventilation_speed=VentilationMode.MEDIUM,
+        co2_current=1250.0,
+        co2_setpoint=900.0,
+        air_temp_current=20.5,
+        air_temp_setpoint=21.5,
+        heating_level=45.5,
+        heating_on=True,
+    )
+
+
+@pytest.mark.parametrize(
+    ("page", "parse", "library_parse"),
+    [
+        (
+            "overview.hta",
+            parse_overview,
+            lambda content: StatusApi(None)._extract_overview_details(content.decode()),
+        ),
+        (
+            "heating.hta",
+            parse_heating,
+            lambda content: TemperatureApi(None)._extract_temperature_data(content),
+        ),
+        (
+            "ventilation.hta",
+            parse_ventilation,
+            lambda content: VentilationApi(None)._extract_data(content),
+        ),
+    ],
+)
+def test_matches_library(page: str, parse, library_parse) -> None:
+    """Test the bulk parsers read what the library's page parsers read."""
+    content = load_page(page)
+    result = parse(content)
+    assert result == type(result)(**vars(library_parse(content)))
+
+
+def test_parse_pages_without_co2_probe() -> None:
+    """Test a unit without a CO2 probe reads None for it."""
+    assert parse_overview(load_page("overview_no_co2.hta")).co_2 is None
+    ventilation = parse_ventilation(load_page("ventilation_no_co2.hta"))
+    assert ventilation.co2_current is None
+    assert ventilation.co2_setpoint is None
+    assert ventilation.air_temp_current == 20.5
+
+
+@pytest.mark.parametrize(
+    ("page", "parse", "fallback_parse"),
+    [
+        ("overview.hta", parse_overview, fallback.parse_overview),
+        ("overview_no_co2.hta", parse_overview, fallback.parse_overview),
+        ("heating.hta", parse_heating, fallback.parse_heating),
+        ("ventilation.hta", parse_ventilation, fallback.parse_ventilation),
+        ("ventilation_no_co2.hta", parse_ventilation, fallback.parse_ventilation),
+    ],
+)
+def test_matches_fallback(page: str, parse, fallback_parse) -> None:
+    """Test the bulk parsers read what the fallback parsers read."""
+    content = load_page(page)
+    assert parse(content) == fallback_parse(content)
+
+
+@pytest.mark.parametrize("parse", [parse_overview, parse_heating, parse_ventilation])
+def test_unexpected_page(parse) -> None:
+    """Test a page without the expected values is refused."""
+    with pytest.raises(BulkParseError):
+        parse(b"<html><body>Login required</body></html>")
+
+
+def test_unexpected_mode() -> None:
+    """Test an unknown mode is refused rather than guessed."""
+    content = load_page("overview.hta").replace(
+        b"AWSCaseLabel2v=4", b"AWSCaseLabel2v=9"
+    )
+    with pytest.raises(BulkParseError):
+        parse_overview(content)
+
+
+def test_parse_cache_hit() -> None:
+    """Test an identical page returns the very same result from the cache."""
+    cache = ParseCache(8)
+    content = load_page("overview.hta")
+
+    result, cached = cache.parse("overview", content)
+    assert not cached
+    again, cached = cache.parse("overview", bytes(content))
+    assert cached
+    assert again is result
+
+    changed, cached = cache.parse("overview", content.replace(b">21.5<", b">21.6<"))
+    assert not cached
+    assert changed.temperature == 21.6
+
+
+def test_parse_cache_keyed_by_dataset() -> None:
+    """Test the same bytes are parsed again for another dataset."""
+    cache = ParseCache(8)
+    content = load_page("heating.hta")
+    cache.parse("heating", content)
+    with pytest.raises(BulkParseError):
+        cache.parse("ventilation", content)
+
+
+def test_parse_cache_evicts_least_recently_used() -> None:
+    """Test the cache keeps only its most recently used pages."""
+    cache = ParseCache(2)
+    pages = [
+        load_page("overview.hta").replace(b">21.5<", f">{value}<".encode())
+        for value in (20.0, 21.0, 22.0)
+    ]
+    first, _ = cache.parse("overview", pages[0])
+    cache.parse("overview", pages[1])
+    assert cache.parse("overview", pages[0]) == (first, True)
+
+    cache.parse("overview", pages[2])
+    assert cache.parse("overview", pages[0])[1]
+    assert not cache.parse("overview", pages[1])[1]
+
+    cache.clear()
+    assert not cache.parse("overview", pages[0])[1]
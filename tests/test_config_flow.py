@@ -0,0 +1,37 @@
+"""Tests for the config flow."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import SOURCE_USER
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.amit_hvac.connection import normalize_host
+from custom_components.amit_hvac.const import DOMAIN
+
+
+def test_normalize_host() -> None:
+    """Test spellings of the same PLC URL normalize to one host."""
+    assert normalize_host("http://plc") == "plc:80"
+    assert normalize_host("http://plc:80/") == "plc:80"
+    assert normalize_host("http://PLC:8080") == "plc:8080"
+    assert normalize_host("plc") == "plc"
+
+
+async def test_same_host_spelled_differently_aborts(hass: HomeAssistant) -> None:
+    """Test a PLC cannot be added twice under another spelling of its URL."""
+    MockConfigEntry(domain=DOMAIN, unique_id="plc:80").add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_HOST: "http://plc:80/", CONF_USERNAME: "user", CONF_PASSWORD: "pass"},
+    )
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
@@ -0,0 +1,81 @@
+"""Tests for the connection manager."""
+
+from __future__ import annotations
+
+import asyncio
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from custom_components.amit_hvac.connection import AmitConnectionManager
+from custom_components.amit_hvac.const import (
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_RATE_LIMIT,
+    DOMAIN,
+)
+from custom_components.amit_hvac.scheduler import RequestPriority
+
+
+def _entry(host: str, **options) -> MockConfigEntry:
+    """Return a config entry for a PLC host."""
+    return MockConfigEntry(domain=DOMAIN, data={CONF_HOST: host}, options=options)
+
+
+async def test_host_capacity_is_lowest_of_its_entries(hass: HomeAssistant) -> None:
+    """Test a shared host is capped at the lowest concurrency of its entries."""
+    manager = AmitConnectionManager(hass)
+    first = _entry("http://plc:80", **{CONF_MAX_CONCURRENT_REQUESTS: 3})
+    second = _entry("http://plc", **{CONF_MAX_CONCURRENT_REQUESTS: 1})
+    other = _entry("http://other", **{CONF_MAX_CONCURRENT_REQUESTS: 4})
+
+    connection = manager.async_register(first)
+    assert connection.host.scheduler.capacity == 3
+    assert manager.async_register(second).host is connection.host
+    assert connection.host.scheduler.capacity == 1
+    assert manager.async_register(other).host.scheduler.capacity == 4
+
+    first.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        first, options={CONF_MAX_CONCURRENT_REQUESTS: 5}
+    )
+    manager.async_update(first)
+    assert connection.host.scheduler.capacity == 1
+
+    manager.async_unregister(second)
+    assert connection.host.scheduler.capacity == 5
+
+
+async def test_poll_phases_differ(hass: HomeAssistant) -> None:
+    """Test entries get distinct poll phases, freed ones are reused."""
+    manager = AmitConnectionManager(hass)
+    first, second = _entry("http://one"), _entry("http://two")
+
+    phase = manager.async_register(first).poll_phase
+    assert manager.async_register(second).poll_phase != phase
+    manager.async_unregister(first)
+    assert manager.async_register(_entry("http://three")).poll_phase == phase
+
+
+async def test_throttle_before_taking_a_slot(hass: HomeAssistant) -> None:
+    """Test a request waiting for the rate limit does not hold a host slot."""
+    manager = AmitConnectionManager(hass)
+    connection = manager.async_register(
+        _entry(
+            "http://plc",
+            **{CONF_MAX_CONCURRENT_REQUESTS: 1, CONF_RATE_LIMIT: 2},
+        )
+    )
+
+    async def request() -> None:
+        async with connection.async_request_slot(RequestPriority.POLL):
+            pass
+
+    await request()
+    # The next request waits half a second for the rate limit, without a slot
+    throttled = asyncio.create_task(request())
+    await asyncio.sleep(0.1)
+    assert not throttled.done()
+    assert connection.host.scheduler._active == 0
+    await throttled
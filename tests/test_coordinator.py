@@ -0,0 +1,117 @@
+"""Tests for the Amit HVAC coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+from plc_simulator import PlcSimulator
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from custom_components.amit_hvac.api import AmitApi
+from custom_components.amit_hvac.api_helper import AmitApiHelper
+from custom_components.amit_hvac.const import DOMAIN
+from custom_components.amit_hvac.coordinator import AmitHvacCoordinator
+from custom_components.amit_hvac.scheduler import RequestPreempted
+
+
+def _helper(hass: HomeAssistant, entry: MockConfigEntry) -> AmitApiHelper:
+    """Return the API helper of a set up entry."""
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+def _make_all_due(coordinator: AmitHvacCoordinator) -> None:
+    """Let the cadence of every dataset elapse."""
+    for dataset, fetched_at in coordinator._fetched_at.items():
+        coordinator._fetched_at[dataset] = fetched_at - coordinator.max_interval
+
+
+@patch("custom_components.amit_hvac.api.WRITE_COOLDOWN", 0)
+async def test_poll_preempted_by_write(
+    hass: HomeAssistant, plc: PlcSimulator, init_integration: MockConfigEntry
+) -> None:
+    """Test a write cancels a poll holding every slot and the data is kept."""
+    helper = _helper(hass, init_integration)
+    coordinator = helper.coordinator
+    # The first write also loads the library, let it out of the way
+    await helper.api.async_set_target_co2(850)
+    await hass.async_block_till_done()
+    data = coordinator.data
+    plc.latency = 0.05
+
+    _make_all_due(coordinator)
+    poll = hass.async_create_task(coordinator.async_refresh())
+    await asyncio.sleep(0.02)
+    async with asyncio.timeout(1):
+        await helper.api.async_set_target_co2(900)
+    await poll
+    await hass.async_block_till_done()
+
+    assert helper.api.metrics.preempted >= 1
+    assert coordinator.last_update_success
+    assert coordinator.data.overview == data.overview
+    assert coordinator.data.ventilation.co2_setpoint == 900
+
+
+async def test_first_poll_preempted(
+    hass: HomeAssistant, plc: PlcSimulator, config_entry: MockConfigEntry
+) -> None:
+    """Test a first poll that writes preempted entirely is retried."""
+
+    async def preempted(self: AmitApi, datasets: list[str], *args) -> dict:
+        return {dataset: RequestPreempted() for dataset in datasets}
+
+    with (
+        patch.object(AmitApi, "async_read", preempted),
+        patch.object(AmitApi, "async_close", autospec=True) as close,
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.SETUP_RETRY
+    assert config_entry.reason == "Poll preempted by a write"
+    close.assert_awaited_once()
+    await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_unchanged_poll_keeps_snapshot(
+    hass: HomeAssistant, plc: PlcSimulator, init_integration: MockConfigEntry
+) -> None:
+    """Test a poll reading identical pages publishes nothing."""
+    coordinator = _helper(hass, init_integration).coordinator
+    data = coordinator.data
+    state = hass.states.get("sensor.ventilation_carbon_dioxide")
+
+    _make_all_due(coordinator)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.data is data
+    assert hass.states.get("sensor.ventilation_carbon_dioxide") is state
+
+
+async def test_insignificant_change_not_written(
+    hass: HomeAssistant, plc: PlcSimulator, init_integration: MockConfigEntry
+) -> None:
+    """Test a reading is only written when it moved by its significant change."""
+    coordinator = _helper(hass, init_integration).coordinator
+    entity_id = "sensor.ventilation_carbon_dioxide"
+    state = hass.states.get(entity_id)
+
+    plc.state.co2 = 652
+    _make_all_due(coordinator)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.data.overview.co_2 == 652
+    assert hass.states.get(entity_id) is state
+
+    plc.state.co2 = 660
+    _make_all_due(coordinator)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    assert state.state == "660"
+    assert state.attributes["samples"] == 3
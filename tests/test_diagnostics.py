@@ -0,0 +1,28 @@
+"""Tests for the diagnostics of the Amit HVAC integration."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+
+from custom_components.amit_hvac.const import DOMAIN
+from custom_components.amit_hvac.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+async def test_diagnostics_redact_host(
+    hass: HomeAssistant, plc_url: str, init_integration: MockConfigEntry
+) -> None:
+    """Test the PLC host is redacted, including from the last error."""
+    breaker = hass.data[DOMAIN][init_integration.entry_id].api.breaker
+    breaker.record_failure(OSError(f"Cannot connect to host {plc_url}"))
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, init_integration)
+
+    assert diagnostics["entry"]["unique_id"] == REDACTED
+    assert diagnostics["entry"]["title"] == "AMiT Hub"
+    assert diagnostics["breaker"]["last_error"] == f"Cannot connect to host {REDACTED}"
+    assert "127.0.0.1" not in str(diagnostics)
@@ -0,0 +1,62 @@
+"""Tests for the reading history."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.amit_hvac.history import RingBuffer
+
+
+def test_window_in_order() -> None:
+    """Test the samples since a time come back oldest first."""
+    buffer = RingBuffer(4)
+    for second in range(3):
+        buffer.append(second * 60, 20 + second)
+
+    assert len(buffer) == 3
+    assert buffer.window(60) == ([60, 120], [21, 22])
+    assert buffer.window(1000) == ([], [])
+
+
+def test_overwrites_oldest() -> None:
+    """Test a full buffer drops its oldest samples."""
+    buffer = RingBuffer(3)
+    for second in range(5):
+        buffer.append(second, second)
+
+    assert len(buffer) == 3
+    assert buffer.window(0) == ([2, 3, 4], [2, 3, 4])
+
+
+def test_statistics() -> None:
+    """Test min, max, mean and the slope per hour over a window."""
+    buffer = RingBuffer(10)
+    # A stale sample outside the window, then a rise of 1 per 10 minutes
+    buffer.append(0, 100)
+    for minute in range(60, 100, 10):
+        buffer.append(minute * 60, 20 + (minute - 60) / 10)
+
+    statistics = buffer.statistics(now=99 * 60, window=40 * 60)
+    assert statistics["count"] == 4
+    assert statistics["min"] == 20
+    assert statistics["max"] == 23
+    assert statistics["mean"] == 21.5
+    assert statistics["slope"] == pytest.approx(6)
+
+
+def test_statistics_without_samples() -> None:
+    """Test an empty window and a single sample have no slope."""
+    buffer = RingBuffer(4)
+    assert buffer.statistics(now=0, window=60) == {
+        "count": 0,
+        "min": None,
+        "max": None,
+        "mean": None,
+        "slope": None,
+    }
+
+    buffer.append(0, 21)
+    statistics = buffer.statistics(now=0, window=60)
+    assert statistics["count"] == 1
+    assert statistics["mean"] == 21
+    assert statistics["slope"] is None
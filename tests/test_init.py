@@ -0,0 +1,49 @@
+"""Tests for the setup of the Amit HVAC integration."""
+
+from __future__ import annotations
+
+from plc_simulator import PlcSimulator
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+
+async def test_setup_and_unload(
+    hass: HomeAssistant, plc: PlcSimulator, init_integration: MockConfigEntry
+) -> None:
+    """Test the entities are set up from the PLC data."""
+    assert init_integration.state is ConfigEntryState.LOADED
+    assert hass.states.get("sensor.ventilation_carbon_dioxide").state == "650"
+    assert hass.states.get("number.ventilation_target_co2").state == "800.0"
+
+    assert await hass.config_entries.async_unload(init_integration.entry_id)
+    assert init_integration.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_zero_reading_creates_entity(
+    hass: HomeAssistant, plc: PlcSimulator, config_entry: MockConfigEntry
+) -> None:
+    """Test a probe reading 0 gets its entity."""
+    plc.state.co2 = 0
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.ventilation_carbon_dioxide").state == "0"
+    await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_missing_probe_skips_entities(
+    hass: HomeAssistant, plc: PlcSimulator, config_entry: MockConfigEntry
+) -> None:
+    """Test a unit without a CO2 probe sets up without its CO2 entities."""
+    plc.state.co2 = None
+    plc.state.co2_setpoint = None
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("sensor.ventilation_carbon_dioxide") is None
+    assert hass.states.get("number.ventilation_target_co2") is None
+    assert hass.states.get("number.ventilation_target_temperature") is not None
+    await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,151 @@
+"""Tests for the request scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.amit_hvac.scheduler import (
+    RequestPreempted,
+    RequestPriority,
+    RequestScheduler,
+)
+
+
+async def _hold(
+    scheduler: RequestScheduler,
+    priority: RequestPriority,
+    log: list[str],
+    name: str,
+    release: asyncio.Event,
+) -> None:
+    """Hold a slot until released, logging when it was granted."""
+    async with scheduler.async_slot(priority):
+        log.append(name)
+        await release.wait()
+
+
+async def test_slots_go_by_priority() -> None:
+    """Test a freed slot goes to writes, then verify reads, then polls."""
+    scheduler = RequestScheduler(1)
+    log: list[str] = []
+    release = asyncio.Event()
+    busy = asyncio.create_task(
+        _hold(scheduler, RequestPriority.VERIFY, log, "busy", release)
+    )
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.create_task(_hold(scheduler, priority, log, name, release))
+        for priority, name in (
+            (RequestPriority.POLL, "poll"),
+            (RequestPriority.VERIFY, "verify"),
+            (RequestPriority.WRITE, "write"),
+        )
+    ]
+    await asyncio.sleep(0)
+    assert log == ["busy"]
+
+    release.set()
+    await asyncio.gather(busy, *waiting)
+    assert log == ["busy", "write", "verify", "poll"]
+
+
+async def test_write_preempts_poll() -> None:
+    """Test a write finding every slot taken cancels the poll in flight."""
+    scheduler = RequestScheduler(1)
+    log: list[str] = []
+    release = asyncio.Event()
+    poll = asyncio.create_task(
+        _hold(scheduler, RequestPriority.POLL, log, "poll", asyncio.Event())
+    )
+    await asyncio.sleep(0)
+    write = asyncio.create_task(
+        _hold(scheduler, RequestPriority.WRITE, log, "write", release)
+    )
+
+    with pytest.raises(RequestPreempted):
+        await poll
+    await asyncio.sleep(0)
+    assert log == ["poll", "write"]
+    release.set()
+    await write
+
+
+async def test_write_does_not_preempt_verify() -> None:
+    """Test only polls are preempted, a verify read is waited for."""
+    scheduler = RequestScheduler(1)
+    log: list[str] = []
+    release = asyncio.Event()
+    verify = asyncio.create_task(
+        _hold(scheduler, RequestPriority.VERIFY, log, "verify", release)
+    )
+    await asyncio.sleep(0)
+    write = asyncio.create_task(
+        _hold(scheduler, RequestPriority.WRITE, log, "write", release)
+    )
+    await asyncio.sleep(0)
+    assert log == ["verify"]
+
+    release.set()
+    await asyncio.gather(verify, write)
+    assert log == ["verify", "write"]
+
+
+async def test_cancelled_waiter_gives_up_its_place() -> None:
+    """Test a cancelled waiter leaves the queue and the slots intact."""
+    scheduler = RequestScheduler(1)
+    log: list[str] = []
+    release = asyncio.Event()
+    busy = asyncio.create_task(
+        _hold(scheduler, RequestPriority.POLL, log, "busy", release)
+    )
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(
+        _hold(scheduler, RequestPriority.POLL, log, "cancelled", release)
+    )
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    release.set()
+    await busy
+    await _hold(scheduler, RequestPriority.POLL, log, "next", release)
+    assert log == ["busy", "next"]
+
+
+async def test_set_capacity() -> None:
+    """Test a raised capacity serves waiters at once, a lowered one on release."""
+    scheduler = RequestScheduler(1)
+    log: list[str] = []
+    release = asyncio.Event()
+    tasks = [
+        asyncio.create_task(
+            _hold(scheduler, RequestPriority.VERIFY, log, str(index), release)
+        )
+        for index in range(3)
+    ]
+    await asyncio.sleep(0)
+    assert log == ["0"]
+
+    scheduler.set_capacity(3)
+    await asyncio.sleep(0)
+    assert log == ["0", "1", "2"]
+
+    scheduler.set_capacity(1)
+    second = asyncio.Event()
+    tasks += [
+        asyncio.create_task(
+            _hold(scheduler, RequestPriority.VERIFY, log, str(index), second)
+        )
+        for index in (3, 4)
+    ]
+    release.set()
+    await asyncio.gather(*tasks[:3])
+    await asyncio.sleep(0)
+    assert log == ["0", "1", "2", "3"]
+
+    second.set()
+    await asyncio.gather(*tasks[3:])
+    assert log == ["0", "1", "2", "3", "4"]
@@ -0,0 +1,60 @@
+"""Tests for the Amit HVAC sensors."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from plc_simulator import PlcSimulator
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.amit_hvac.const import ANALYTICS_REFRESH_INTERVAL, DOMAIN
+from custom_components.amit_hvac.sensor import AmitSensorEntity
+
+
+async def test_analytics_refresh_while_pages_are_unchanged(
+    hass: HomeAssistant,
+    plc: PlcSimulator,
+    init_integration: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the run time moves on although polls publish nothing."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id].coordinator
+    entity_id = "sensor.ventilation_run_time_low"
+    data = coordinator.data
+    assert hass.states.get(entity_id).state == "0.0"
+
+    freezer.tick(timedelta(minutes=10))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.data is data
+    assert hass.states.get(entity_id).state == "0.0"
+
+    freezer.tick(timedelta(seconds=ANALYTICS_REFRESH_INTERVAL))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert float(hass.states.get(entity_id).state) > 0.16
+
+
+async def test_sensors_skip_updates_of_other_datasets(
+    hass: HomeAssistant, plc: PlcSimulator, init_integration: MockConfigEntry
+) -> None:
+    """Test the overview sensors are not recomputed when only heating changed."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id].coordinator
+
+    plc.state.comfort_temperature += 1
+    with patch.object(
+        AmitSensorEntity, "_async_write_if_changed", autospec=True
+    ) as write:
+        for dataset, fetched_at in coordinator._fetched_at.items():
+            coordinator._fetched_at[dataset] = fetched_at - coordinator.max_interval
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    assert coordinator.data.changed == {"heating"}
+    write.assert_not_called()